@@ -0,0 +1,548 @@
+#==============================================================================
+# Siqo bracket structure library
+#------------------------------------------------------------------------------
+import re
+import threading
+from   collections     import OrderedDict
+from   collections.abc import Mapping
+from   types           import MappingProxyType
+
+from   general         import braSplit, structDelOuts, aliasSplit
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER      = '1.00'
+
+_KEYS     = ('res', 'txt', 'bra', 'ket', 'del+', 'del-', 'sub')
+
+_CACHE_SIZE = 1024     # Default max pocet poloziek v BraCache
+
+# Tokeny select listu: string, quoted identifier, zatvorky a ciarka, medzery, ostatne slova
+_SEL_TOKEN  = re.compile(r"'(?:[^']|'')*'?|\"[^\"]*\"?|[(),]|\s+|[^\s(),'\"]+")
+_SEL_ALIAS  = re.compile(r'[A-Za-z_][A-Za-z0-9_$#]*$|"[^"]+"$')
+_SEL_OPERS  = set('+-*/|=<>,(.')
+_SEL_WORDS  = {'AS', 'AND', 'OR', 'NOT', 'IS', 'IN', 'LIKE', 'BETWEEN', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END',
+               'NULL', 'DISTINCT', 'ALL', 'ASC', 'DESC', 'FROM', 'TRUE', 'FALSE', 'PRIOR', 'ESCAPE'}
+_SEL_ENDS   = {'END', 'NULL', 'TRUE', 'FALSE'}      # Slova, ktorymi moze vyraz koncit, za nimi moze byt alias
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+_patterns = {}    # Cache skompilovanych vzorov {(bra, ket, delims): pattern}
+
+#==============================================================================
+# BraStruct
+#------------------------------------------------------------------------------
+class BraStruct(Mapping):
+    """
+    Result of braScan. Behaves as the dict returned by general.braSplit
+    (keys res/txt/bra/ket/del+/del-/sub), but keeps only offsets into the
+    scanned text and builds the values on first access.
+    """
+
+    __slots__ = ('src', 'start', 'end', 'base', 'res', 'msg', 'complete', 'dels', 'cuts', 'cut', 'subs', '_vals')
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, src, start, base):
+        "Creates an empty structure for text src[start:] positioned at base in the parent text"
+
+        self.src      = src      # Cely skenovany text
+        self.start    = start    # Offset zaciatku textu tejto urovne v src
+        self.end      = None     # Offset konca textu tejto urovne v src (pozicia ket)
+        self.base     = base     # Pozicia src[0] v texte nadradenej urovne (totPos)
+        self.res      = 'OK'     # Vysledny stav analyzy
+        self.msg      = None     # Chybova sprava, ak res != 'OK'
+        self.complete = True     # Ci bola urovne doskenovana do konca
+        self.dels     = []       # Offsety delimiterov tejto urovne
+        self.cuts     = []       # Offsety zaciatkov casti bez vnoreneho textu pre kazdu cast
+        self.cut      = start    # Offset zaciatku aktualnej casti bez vnoreneho textu
+        self.subs     = []       # Vnorene struktury
+        self._vals    = {}       # Cache vypocitanych hodnot
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, key):
+
+        if key in self._vals: return self._vals[key]
+
+        if   key == 'res' : val = self.res
+        elif key == 'txt' : val = self.msg if self.msg is not None else self.src[self.start:self.end]
+        elif key == 'bra' : val = self.base + self.start - 1
+        elif key == 'ket' : val = self.base + self.end
+        elif key == 'del+': val = self._delAll()
+        elif key == 'del-': val = self._delOut()
+        elif key == 'sub' : val = list(self.subs)
+        else              : raise KeyError(key)
+
+        self._vals[key] = val
+        return val
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+
+        return iter(_KEYS)
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+
+        return len(_KEYS)
+
+    #--------------------------------------------------------------------------
+    def __repr__(self):
+
+        return f'BraStruct({self.res}, bra={self["bra"]}, ket={self["ket"]}, parts={len(self.dels)+1}, subs={len(self.subs)})'
+
+    #--------------------------------------------------------------------------
+    def _bounds(self):
+        "Returns list of (start, end) offsets of delimited parts"
+
+        starts = [self.start] + [pos + 1 for pos in self.dels]
+        ends   = list(self.dels)
+
+        if self.complete: ends.append(self.end)
+        return zip(starts, ends)
+
+    #--------------------------------------------------------------------------
+    def _delAll(self):
+        "Returns delimited parts including nested text"
+
+        src = self.src
+        return [src[a:b] for a, b in self._bounds()]
+
+    #--------------------------------------------------------------------------
+    def _delOut(self):
+        "Returns stripped non-empty delimited parts without nested text"
+
+        src   = self.src
+        toRet = []
+
+        for cut, (_, end) in zip(self.cuts, self._bounds()):
+
+            part = src[cut:end].strip()
+            if part != '': toRet.append(part)
+
+        return toRet
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def toDict(self):
+        "Returns the structure materialised as plain nested dict, same as general.braSplit"
+
+        toRet        = dict(self.items())
+        toRet['sub'] = [sub.toDict() for sub in self.subs]
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def delOuts(self):
+        "Returns the same list as general.structDelOuts for this structure"
+
+        toRet = []
+        stack = [self]
+
+        # Pre-order prechod: najprv vlastna uroven, potom vnorene urovne zlava
+        while stack:
+
+            struct = stack.pop()
+            toRet.extend(struct['del-'])
+            stack.extend(reversed(struct.subs))
+
+        return toRet
+
+#==============================================================================
+# Scanner
+#------------------------------------------------------------------------------
+def _pattern(bra, ket, delims):
+    "Returns compiled pattern matching bra, ket and every delimiter character"
+
+    key   = (bra, ket, delims)
+    toRet = _patterns.get(key)
+
+    if toRet is None:
+        toRet = re.compile('[' + re.escape(bra + ket + delims) + ']')
+        _patterns[key] = toRet
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def braScan(txt, bra='(', ket=')', delims=',', totPos=0):
+    """
+    Same as general.braSplit in one linear pass. Only bra, ket and delimiter
+    characters are visited, nesting is tracked by an explicit stack and the
+    result stores offsets instead of copies of substrings.
+    """
+
+    #--------------------------------------------------------------------------
+    # Nestandardne zadanie (viacznakove alebo prekryvajuce sa bra/ket/delims)
+    # riesi povodna implementacia
+    #--------------------------------------------------------------------------
+    if len(bra) != 1 or len(ket) != 1 or bra == ket or bra in delims or ket in delims:
+        return braSplit(txt, bra, ket, delims, totPos)
+
+    toRet     = BraStruct(txt, 0, totPos)
+    toRet.end = len(txt)
+    stack     = [toRet]
+    node      = toRet
+
+    #--------------------------------------------------------------------------
+    # Preskenujem iba vyznamne znaky
+    #--------------------------------------------------------------------------
+    for match in _pattern(bra, ket, delims).finditer(txt):
+
+        pos  = match.start()
+        char = txt[pos]
+
+        #----------------------------------------------------------------------
+        # Vnorim sa
+        #----------------------------------------------------------------------
+        if char == bra:
+
+            node = BraStruct(txt, pos + 1, totPos)
+            stack.append(node)
+
+        #----------------------------------------------------------------------
+        # Vynorim sa
+        #----------------------------------------------------------------------
+        elif char == ket:
+
+            # Skontrolujem ci su bra-ket vybalancovane
+            if len(stack) == 1:
+
+                toRet.res      = 'ER'
+                toRet.msg      = f'ERROR: extra {ket} at position {pos}'
+                toRet.complete = False
+                return toRet
+
+            # Uzavriem vnorenu uroven vratane jej posledneho cut-u
+            node.end = pos
+            node.cuts.append(node.cut)
+
+            stack.pop()
+            stack[-1].subs.append(node)
+
+            # Text pred vnorenim nepatri medzi casti bez vnoreneho textu
+            node     = stack[-1]
+            node.cut = pos + 1
+
+        #----------------------------------------------------------------------
+        # Delimiter v aktualnej urovni vnorenia
+        #----------------------------------------------------------------------
+        else:
+
+            node.dels.append(pos)
+            node.cuts.append(node.cut)
+            node.cut = pos + 1
+
+    #--------------------------------------------------------------------------
+    # Skontrolujem ci su bra-ket vybalancovane
+    #--------------------------------------------------------------------------
+    if len(stack) > 1:
+
+        toRet.res      = 'ER'
+        toRet.msg      = f'ERROR: {ket} expected but missing'
+        toRet.complete = False
+        return toRet
+
+    #--------------------------------------------------------------------------
+    # Doplnim posledny cut
+    #--------------------------------------------------------------------------
+    toRet.cuts.append(toRet.cut)
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def braScanOuts(txt, bra='(', ket=')', delims=',', totPos=0):
+    "Same as general.braDelOuts using braScan"
+
+    struct = braScan(txt, bra, ket, delims, totPos)
+
+    if isinstance(struct, BraStruct): return struct.delOuts()
+    else                            : return structDelOuts(struct)
+
+#------------------------------------------------------------------------------
+def braIter(txt, bra='(', ket=')', delims=',', totPos=0, nested=False, depths=False):
+    """
+    Yields delimited top-level parts of txt while scanning, without building
+    the structure. Parts are del- parts (stripped, without nested text) or
+    del+ parts if nested=True. If depths=True, parts of all nesting levels are
+    yielded as (depth, offset, part) tuples in the order they are closed, i.e.
+    inner parts before the part containing them. Unbalanced bra/ket raise
+    ValueError once the scan reaches the error.
+    """
+
+    if len(bra) != 1 or len(ket) != 1 or bra == ket or bra in delims or ket in delims:
+        raise ValueError(f"braIter: bra '{bra}' and ket '{ket}' must be distinct single characters not in delims '{delims}'")
+
+    # Pre kazdu otvorenu uroven [zaciatok casti, zaciatok casti bez vnoreneho textu]
+    stack = [[0, 0]]
+
+    #--------------------------------------------------------------------------
+    def part(frame, end):
+        "Returns (offset, part) of the part ending at end or None if there is nothing to yield"
+
+        if nested: return (totPos + frame[0], txt[frame[0]:end])
+
+        cut  = txt[frame[1]:end]
+        text = cut.strip()
+
+        if text == '': return None
+        return (totPos + frame[1] + len(cut) - len(cut.lstrip()), text)
+
+    #--------------------------------------------------------------------------
+    # Preskenujem iba vyznamne znaky
+    #--------------------------------------------------------------------------
+    for match in _pattern(bra, ket, delims).finditer(txt):
+
+        pos  = match.start()
+        char = txt[pos]
+
+        if char == bra:
+            stack.append([pos + 1, pos + 1])
+            continue
+
+        if char == ket and len(stack) == 1:
+            raise ValueError(f'braIter: ERROR: extra {ket} at position {pos}')
+
+        #----------------------------------------------------------------------
+        # Delimiter alebo ket uzatvara cast aktualnej urovne
+        #----------------------------------------------------------------------
+        depth = len(stack) - 1
+
+        if depths or depth == 0:
+
+            item = part(stack[-1], pos)
+
+            if item is not None:
+                if depths: yield (depth, item[0], item[1])
+                else     : yield item[1]
+
+        if char == ket:
+            stack.pop()
+            stack[-1][1] = pos + 1
+
+        else:
+            stack[-1][0] = stack[-1][1] = pos + 1
+
+    #--------------------------------------------------------------------------
+    # Skontrolujem ci su bra-ket vybalancovane a doplnim posledny cut
+    #--------------------------------------------------------------------------
+    if len(stack) > 1: raise ValueError(f'braIter: ERROR: {ket} expected but missing')
+
+    item = part(stack[0], len(txt))
+
+    if item is not None:
+        if depths: yield (0, item[0], item[1])
+        else     : yield item[1]
+
+#==============================================================================
+# BraCache
+#------------------------------------------------------------------------------
+def _freeze(obj):
+    "Returns read-only copy of nested dict/list structure"
+
+    if isinstance(obj, Mapping): return MappingProxyType({key: _freeze(val) for key, val in obj.items()})
+    if isinstance(obj, list   ): return tuple(_freeze(val) for val in obj)
+
+    return obj
+
+#------------------------------------------------------------------------------
+class BraCache:
+    """
+    Opt-in bounded LRU cache for parsing of repeated query templates. Results
+    are frozen (dicts as MappingProxyType, lists as tuples), so callers can not
+    corrupt cached structures shared with other callers.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, maxSize=_CACHE_SIZE):
+        "Call constructor of BraCache and initialise it with empty cache"
+
+        self.maxSize   = maxSize         # Max pocet poloziek v cache
+        self.items     = OrderedDict()   # LRU cache {key: frozen result}
+        self.hits      = 0               # Pocet najdenych vysledkov
+        self.misses    = 0               # Pocet vypocitanych vysledkov
+        self.evictions = 0               # Pocet vyradenych vysledkov
+        self._lock     = threading.Lock()
+
+    #--------------------------------------------------------------------------
+    def _get(self, key, func, *args):
+        "Returns cached result for key or computes, freezes and stores func(*args)"
+
+        with self._lock:
+
+            if key in self.items:
+
+                self.hits += 1
+                self.items.move_to_end(key)
+                return self.items[key]
+
+            self.misses += 1
+
+        #----------------------------------------------------------------------
+        # Vypocet prebieha mimo zamku
+        #----------------------------------------------------------------------
+        toRet = _freeze(func(*args))
+
+        with self._lock:
+
+            self.items[key] = toRet
+            self.items.move_to_end(key)
+
+            while len(self.items) > self.maxSize:
+
+                self.items.popitem(last=False)
+                self.evictions += 1
+
+        return toRet
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def braSplit(self, txt, bra='(', ket=')', delims=',', totPos=0):
+        "Cached braScan, returns read-only structure"
+
+        return self._get(('braSplit', txt, bra, ket, delims, totPos), braScan, txt, bra, ket, delims, totPos)
+
+    #--------------------------------------------------------------------------
+    def braDelOuts(self, txt, bra='(', ket=')', delims=',', totPos=0):
+        "Cached braScanOuts, returns tuple"
+
+        return self._get(('braDelOuts', txt, bra, ket, delims, totPos), braScanOuts, txt, bra, ket, delims, totPos)
+
+    #--------------------------------------------------------------------------
+    def aliasSplit(self, txt):
+        "Cached general.aliasSplit"
+
+        return self._get(('aliasSplit', txt), aliasSplit, txt)
+
+    #--------------------------------------------------------------------------
+    def stats(self):
+        "Returns dict with cache counters"
+
+        return {'size':len(self.items), 'maxSize':self.maxSize, 'hits':self.hits, 'misses':self.misses, 'evictions':self.evictions}
+
+    #--------------------------------------------------------------------------
+    def clear(self):
+        "Clears cache and counters"
+
+        with self._lock:
+
+            self.items.clear()
+            self.hits = self.misses = self.evictions = 0
+
+#==============================================================================
+# Select-list parser
+#------------------------------------------------------------------------------
+def _selItem(toks, offset):
+    "Returns (expression, alias, offset) for tokens [(text, depth)] of one select-list item"
+
+    # Odstranim medzery na okrajoch
+    while toks and toks[-1][0] == ' ': toks.pop()
+
+    words = [i for i, (tok, depth) in enumerate(toks) if depth == 0 and tok != ' ']
+
+    #--------------------------------------------------------------------------
+    # Explicitny alias cez AS
+    #--------------------------------------------------------------------------
+    if len(words) >= 3 and toks[words[-2]][0].upper() == 'AS' and _SEL_ALIAS.match(toks[words[-1]][0]):
+        return (''.join(tok for tok, _ in toks[:words[-2]]).strip(), toks[words[-1]][0], offset)
+
+    #--------------------------------------------------------------------------
+    # Implicitny alias: identifikator za medzerou, pred ktorou nie je operator
+    #--------------------------------------------------------------------------
+    if len(words) >= 2 and words[-1] - words[-2] == 2:
+
+        last = toks[words[-1]][0]
+        prev = toks[words[-2]][0]
+
+        if _SEL_ALIAS.match(last) and last.upper() not in _SEL_WORDS and prev[-1] not in _SEL_OPERS and (prev.upper() not in _SEL_WORDS or prev.upper() in _SEL_ENDS):
+            return (''.join(tok for tok, _ in toks[:words[-2]+1]), last, offset)
+
+    #--------------------------------------------------------------------------
+    return (''.join(tok for tok, _ in toks), None, offset)
+
+#------------------------------------------------------------------------------
+def selectSplit(txt):
+    """
+    Splits SQL select list into [(expression, alias, offset)] in one scan.
+    Commas and AS inside brackets or quotes are ignored, whitespace outside
+    quotes is shrunk to single space, AS is case-insensitive and offset is
+    the position of the expression in txt. Raises ValueError for unbalanced
+    brackets.
+    """
+
+    toRet  = []
+    toks   = []          # Tokeny aktualnej polozky [(text, depth)]
+    depth  = 0
+    offset = None
+
+    for match in _SEL_TOKEN.finditer(txt):
+
+        tok = match.group()
+
+        #----------------------------------------------------------------------
+        # Medzery zmensim na jednu, na zaciatku polozky ich vynecham
+        #----------------------------------------------------------------------
+        if tok.isspace():
+            if toks and toks[-1][0] != ' ': toks.append((' ', depth))
+            continue
+
+        #----------------------------------------------------------------------
+        # Ciarka v najvyssej urovni ukoncuje polozku
+        #----------------------------------------------------------------------
+        if tok == ',' and depth == 0:
+
+            if toks: toRet.append(_selItem(toks, offset))
+
+            toks   = []
+            offset = None
+            continue
+
+        if offset is None: offset = match.start()
+
+        if   tok == '(': depth += 1
+        elif tok == ')':
+            depth -= 1
+            if depth < 0: raise ValueError(f'selectSplit: ERROR: extra ) at position {match.start()}')
+
+        toks.append((tok, depth if tok != '(' else depth - 1))
+
+    #--------------------------------------------------------------------------
+    if depth > 0: raise ValueError('selectSplit: ERROR: ) expected but missing')
+
+    if toks: toRet.append(_selItem(toks, offset))
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def selectSplitBatch(stmts):
+    "Returns list of selectSplit results for iterable of select lists, identical select lists are parsed once"
+
+    memo  = {}
+    toRet = []
+
+    for stmt in stmts:
+
+        res = memo.get(stmt)
+
+        if res is None:
+            res        = selectSplit(stmt)
+            memo[stmt] = res
+
+        toRet.append(list(res))
+
+    return toRet
+
+#==============================================================================
+# Bracket structure
+#------------------------------------------------------------------------------
+print(f'SIQO bracket library ver {_VER}')
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
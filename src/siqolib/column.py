@@ -0,0 +1,343 @@
+#==============================================================================
+# Siqo column library
+#------------------------------------------------------------------------------
+import re
+
+try   : import numpy as np
+except ImportError: np = None
+
+import general         as gen
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER      = '1.00'
+
+_SEPS     = str.maketrans('', '', ' .-/')                # Oddelovace odstranovane validatormi
+_DIGITS   = re.compile(r'[0-9]*')                        # Iba ASCII cislice, pouziva sa fullmatch
+_NUMBER   = re.compile(r'-?(?:\d+\.?\d*|\.\d+)')         # To iste co isNumber, pouziva sa fullmatch
+_TIME     = re.compile("^\\d{2}[ .:-][A-Z]{3}[ .:-]\\d{2}[ .:-]\\d{2}[ .:-]\\d{2}[ .:-]\\d{2}[.]\\d{6} [AP]M|^\\d{4}[ .:-]\\d{2}[ .:-]\\d{2}[ .:-]\\d{2}[ .:-]\\d{2}[ .:-]\\d{2}|^\\d{2}[ .:-]\\d{2}[ .:-]\\d{2}[ .:-]\\d{2}[ .:-]\\d{2}[ .:-]\\d{2}|^\\d{2}[.:-]\\d{2}[.:-]\\d{2}\\s*$|^\\d{2}:\\d{2}:\\d{2}$|^\\d{2}:\\d{2}$")
+
+_MDAYS    = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+_CHUNK    = 65536      # Pocet riadkov spracovanych vektorovo naraz
+_WIDTH    = 32         # Dlhsie hodnoty sa vyhodnocuju skalarne
+_MEMO     = 100000     # Default max pocet hodnot v pamati SiqoDedup
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Column utilities
+#------------------------------------------------------------------------------
+def _values(col):
+    "Returns column as list of strings"
+
+    if np is not None and isinstance(col, np.ndarray): return col.tolist()
+    return list(col)
+
+#------------------------------------------------------------------------------
+def _mask(vals):
+    "Returns boolean mask as numpy array if numpy is available, list otherwise"
+
+    if np is not None: return np.array(vals, dtype=bool)
+    return [bool(val) for val in vals]
+
+#------------------------------------------------------------------------------
+def _okDate(yy, mm, dd):
+    "Returns True if yy.mm.dd is valid date, same as datetime.date() without exception"
+
+    if yy < 1 or mm < 1 or mm > 12 or dd < 1: return False
+    return dd <= _MDAYS[mm] + (mm == 2 and yy % 4 == 0 and (yy % 100 != 0 or yy % 400 == 0))
+
+#------------------------------------------------------------------------------
+def _okDates(yy, mm, dd):
+    "Vectorized _okDate over numpy int arrays"
+
+    mi    = np.clip(mm, 0, 12)
+    leap  = (yy % 4 == 0) & ((yy % 100 != 0) | (yy % 400 == 0))
+    mdays = np.array(_MDAYS)[mi] + ((mi == 2) & leap)
+
+    return (yy >= 1) & (mm >= 1) & (mm <= 12) & (dd >= 1) & (dd <= mdays)
+
+#------------------------------------------------------------------------------
+def _digitMatrix(strs):
+    "Returns (digits [n, width], lengths, mask of ASCII digit rows) for list of strings"
+
+    n     = len(strs)
+    lens  = np.fromiter(map(len, strs), dtype=np.int64, count=n)
+    width = min(max(int(lens.max()) if n else 0, 8), _WIDTH)
+
+    raw   = np.array(strs, dtype=f'U{width}')
+    codes = raw.view(np.uint32).reshape(n, width)
+
+    # Znaky za koncom stringu su 0, preto ich z testu na cislice vynecham
+    inside = np.arange(width) < lens[:, None]
+    isDig  = np.all(~inside | ((codes >= 48) & (codes <= 57)), axis=1) & (lens <= width)
+    digs   = codes.astype(np.int32) - 48
+
+    return digs, lens, isDig
+
+#------------------------------------------------------------------------------
+def _num(digs, a, b):
+    "Returns numbers composed of digit columns a..b-1"
+
+    toRet = digs[:, a]
+    for j in range(a+1, b): toRet = toRet * 10 + digs[:, j]
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def _apply(clean, vector, scalar, other):
+    """
+    Evaluates validator over cleaned column. ASCII digit values are evaluated
+    by vector(digits, lengths) with numpy or by scalar(s) without it, all other
+    values by original general validator other(s).
+    """
+
+    #--------------------------------------------------------------------------
+    # Bez numpy iba skalarne bez vynimiek
+    #--------------------------------------------------------------------------
+    if np is None:
+        return [scalar(s) if _DIGITS.fullmatch(s) else bool(other(s)) for s in clean]
+
+    #--------------------------------------------------------------------------
+    # Cisla vektorovo, ostatne hodnoty povodnym validatorom
+    #--------------------------------------------------------------------------
+    toRet = np.zeros(len(clean), dtype=bool)
+
+    for start in range(0, len(clean), _CHUNK):
+
+        chunk             = clean[start:start+_CHUNK]
+        digs, lens, isDig = _digitMatrix(chunk)
+        part              = toRet[start:start+_CHUNK]
+
+        part[isDig] = vector(digs[isDig], lens[isDig])
+        for i in np.flatnonzero(~isDig).tolist(): part[i] = bool(other(chunk[i]))
+
+    return toRet
+
+#==============================================================================
+# Digit kernels
+#------------------------------------------------------------------------------
+def _mod11One(s):
+
+    return s != '' and int(s) % 11 == 0
+
+#------------------------------------------------------------------------------
+def _mod11Vec(digs, lens):
+
+    rest = np.zeros(len(lens), dtype=np.int32)
+
+    for j in range(digs.shape[1]): rest = np.where(j < lens, (rest * 10 + digs[:, j]) % 11, rest)
+
+    return (lens > 0) & (rest == 0)
+
+#------------------------------------------------------------------------------
+def _yy5mddOne(s):
+
+    if len(s) < 6: return False
+
+    yy, mm, dd = int(s[0:2]), int(s[2:4]), int(s[4:6])
+    return _okDate(yy, mm, dd) or _okDate(yy, mm-50, dd)
+
+#------------------------------------------------------------------------------
+def _yy5mddVec(digs, lens):
+
+    yy, mm, dd = _num(digs, 0, 2), _num(digs, 2, 4), _num(digs, 4, 6)
+    return (lens >= 6) & (_okDates(yy, mm, dd) | _okDates(yy, mm-50, dd))
+
+#------------------------------------------------------------------------------
+def _rcOne(s):
+
+    return 9 <= len(s) <= 10 and _yy5mddOne(s) and _mod11One(s)
+
+#------------------------------------------------------------------------------
+def _rcVec(digs, lens):
+
+    return (lens >= 9) & (lens <= 10) & _yy5mddVec(digs, lens) & _mod11Vec(digs, lens)
+
+#------------------------------------------------------------------------------
+def _ddmmyyyyOne(s):
+
+    if len(s) < 6: return False
+
+    yy = int(s[4:8]) if len(s) > 7 else int(s[4:6])
+    return _okDate(yy, int(s[2:4]), int(s[0:2]))
+
+#------------------------------------------------------------------------------
+def _ddmmyyyyVec(digs, lens):
+
+    yy = np.where(lens > 7, _num(digs, 4, 8), _num(digs, 4, 6))
+    return (lens >= 6) & _okDates(yy, _num(digs, 2, 4), _num(digs, 0, 2))
+
+#------------------------------------------------------------------------------
+def _yyyymmddOne(s):
+
+    if len(s) < 8: return False
+
+    yy = int(s[0:4])
+    return 1900 <= yy <= 2200 and _okDate(yy, int(s[4:6]), int(s[6:8]))
+
+#------------------------------------------------------------------------------
+def _yyyymmddVec(digs, lens):
+
+    yy = _num(digs, 0, 4)
+    return (lens >= 8) & (yy >= 1900) & (yy <= 2200) & _okDates(yy, _num(digs, 4, 6), _num(digs, 6, 8))
+
+#==============================================================================
+# Column validators
+#------------------------------------------------------------------------------
+def isNumberCol(col):
+    "Returns boolean mask of general.isNumber for column of strings"
+
+    match = _NUMBER.fullmatch
+    return _mask([match(s) is not None for s in _values(col)])
+
+#------------------------------------------------------------------------------
+def mod11Col(col):
+    "Returns boolean mask of general.mod11 for column of strings"
+
+    clean = [s.translate(_SEPS) for s in _values(col)]
+    return _apply(clean, _mod11Vec, _mod11One, gen.mod11)
+
+#------------------------------------------------------------------------------
+def isRcCol(col):
+    "Returns boolean mask of general.isRc for column of strings"
+
+    clean = [s.translate(_SEPS) for s in _values(col)]
+    return _apply(clean, _rcVec, _rcOne, gen.isRc)
+
+#------------------------------------------------------------------------------
+def yy5mddCol(col):
+    "Returns boolean mask of general.yy5mdd for column of strings without separators"
+
+    clean = _values(col)
+    return _apply(clean, _yy5mddVec, _yy5mddOne, gen.yy5mdd)
+
+#------------------------------------------------------------------------------
+def ddmmyyyyCol(col):
+    "Returns boolean mask of general.ddmmyyyy for column of strings"
+
+    clean = [s.translate(_SEPS) for s in _values(col)]
+    return _apply(clean, _ddmmyyyyVec, _ddmmyyyyOne, gen.ddmmyyyy)
+
+#------------------------------------------------------------------------------
+def yyyymmddCol(col):
+    "Returns boolean mask of general.yyyymmdd for column of strings"
+
+    clean = [s.translate(_SEPS) for s in _values(col)]
+    return _apply(clean, _yyyymmddVec, _yyyymmddOne, gen.yyyymmdd)
+
+#------------------------------------------------------------------------------
+def isTimeCol(col):
+    "Returns boolean mask of general.isTime for column of strings"
+
+    search = _TIME.search
+    return _mask([search(s) is not None for s in _values(col)])
+
+#------------------------------------------------------------------------------
+def isDateCol(col):
+    "Returns boolean mask of general.isDate for column of strings"
+
+    vals  = _values(col)
+    times = isTimeCol(vals)
+    dmy   = ddmmyyyyCol(vals)
+    ymd   = yyyymmddCol(vals)
+
+    if np is not None: return times | dmy | ymd
+    return [t or d or y for t, d, y in zip(times, dmy, ymd)]
+
+#==============================================================================
+# Dictionary-encoded evaluation
+#------------------------------------------------------------------------------
+def factorize(col):
+    "Returns (uniques, codes) so that col[i] == uniques[codes[i]]. Codes are numpy int array if numpy is available"
+
+    index = {}
+    codes = [index.setdefault(val, len(index)) for val in _values(col)]
+
+    if np is not None: codes = np.array(codes, dtype=np.int64)
+
+    return list(index), codes
+
+#------------------------------------------------------------------------------
+class SiqoDedup:
+    """
+    Dedup-first evaluation of a column function (isRcCol, isDateCol,
+    SiqoMask.maskCol, ...). The column is factorized, the function runs only
+    on unique values not yet in the bounded memo and results are broadcast
+    back by codes. One instance can be shared across batches of a column.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, func, scalar=False, maxSize=_MEMO):
+        "Call constructor of SiqoDedup for column function func, or scalar function if scalar=True"
+
+        self.func    = func        # Funkcia nad stlpcom alebo nad jednou hodnotou
+        self.scalar  = scalar      # Ci je func skalarna
+        self.maxSize = maxSize     # Max pocet hodnot v memo
+        self.memo    = {}          # Memo {hodnota: vysledok}
+        self.rows    = 0           # Pocet vyhodnotenych riadkov
+        self.evals   = 0           # Pocet skutocnych volani funkcie na hodnotu
+
+    #--------------------------------------------------------------------------
+    def _evaluate(self, vals):
+        "Returns list of results of func for list of values"
+
+        self.evals += len(vals)
+
+        if self.scalar: return [self.func(val) for val in vals]
+
+        res = self.func(vals)
+        return res.tolist() if np is not None and isinstance(res, np.ndarray) else list(res)
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def __call__(self, col):
+        "Returns results of func for every value of col, numpy array if numpy is available"
+
+        uniques, codes = factorize(col)
+        memo           = self.memo
+
+        #----------------------------------------------------------------------
+        # Vyhodnotim iba hodnoty, ktore este nie su v memo
+        #----------------------------------------------------------------------
+        todo = [val for val in uniques if val not in memo]
+        done = dict(zip(todo, self._evaluate(todo))) if todo else {}
+
+        results = [done[val] if val in done else memo[val] for val in uniques]
+
+        #----------------------------------------------------------------------
+        # Ulozim nove vysledky, najstarsie hodnoty vyradim
+        #----------------------------------------------------------------------
+        memo.update(done)
+
+        while len(memo) > self.maxSize: del memo[next(iter(memo))]
+
+        self.rows += len(codes)
+
+        #----------------------------------------------------------------------
+        # Rozpisem vysledky do riadkov
+        #----------------------------------------------------------------------
+        if np is not None: return np.array(results)[codes] if results else np.array([], dtype=bool)
+        return [results[code] for code in codes]
+
+    #--------------------------------------------------------------------------
+    def stats(self):
+        "Returns dict with evaluation counters"
+
+        return {'rows':self.rows, 'evals':self.evals, 'memo':len(self.memo), 'maxSize':self.maxSize}
+
+#==============================================================================
+# Column library
+#------------------------------------------------------------------------------
+print(f'SIQO column library ver {_VER}')
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
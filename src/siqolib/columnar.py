@@ -0,0 +1,363 @@
+#==============================================================================
+# Siqo columnar cache library
+#------------------------------------------------------------------------------
+import sys
+import json
+import mmap
+import struct
+import pickle
+from   array              import array
+
+from   fileio             import SiqoAtomicWriter
+
+try   : import numpy as np
+except ImportError: np = None
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_MAGIC      = b'SIQOCOLS'
+_COL_VER    = 1                            # Verzia formatu
+_TAIL       = struct.Struct('<QQ8s')       # offset a dlzka schemy, magic
+_ALIGN      = 64                           # Zarovnanie blokov pre zero-copy numpy
+_BLOCK      = 65536                        # Pocet riadkov dekodovanych naraz pri iteracii
+
+# Typove kody array modulu a zodpovedajuce little-endian numpy typy
+_CODES      = {'int':'q', 'float':'d', 'bool':'b'}
+_DTYPES     = {'q':'<i8', 'd':'<f8', 'b':'<i1', 'i':'<i4'}
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Writing
+#------------------------------------------------------------------------------
+def _colType(vals):
+    "Returns storage type of the column: none, bool, int, float, str or obj"
+
+    types = {type(val) for val in vals if val is not None}
+
+    if not types         : return 'none'
+    if types == {bool}   : return 'bool'
+    if types == {int}    : return 'int'
+    if types == {float}  : return 'float'
+    if types == {str}    : return 'str'
+
+    # Zmiesane typy, ulozim ich bezstratovo cez pickle
+    return 'obj'
+
+#------------------------------------------------------------------------------
+def _typed(code, vals):
+    "Returns little-endian bytes of typed array"
+
+    arr = array(code, vals)
+    if sys.byteorder == 'big': arr.byteswap()
+
+    return arr.tobytes()
+
+#------------------------------------------------------------------------------
+def _encode(vals):
+    "Returns (schema, {part: bytes}) of one column"
+
+    typ    = _colType(vals)
+    schema = {'type':typ}
+    parts  = {}
+
+    #--------------------------------------------------------------------------
+    # Cisla a bool ako typove pole, None ako maska
+    #--------------------------------------------------------------------------
+    if typ in _CODES:
+
+        fill = float('nan') if typ == 'float' else 0
+
+        try   : parts['data'] = _typed(_CODES[typ], [fill if val is None else val for val in vals])
+        except OverflowError: typ = schema['type'] = 'obj'
+
+        if typ != 'obj' and None in vals: parts['nulls'] = bytes([val is None for val in vals])
+
+    #--------------------------------------------------------------------------
+    # Stringy ako slovnik unikatnych hodnot a kody, None ma kod -1
+    #--------------------------------------------------------------------------
+    if typ == 'str':
+
+        index = {}
+        codes = [-1 if val is None else index.setdefault(val, len(index)) for val in vals]
+
+        parts['data'] = _typed('i', codes)
+        parts['dict'] = pickle.dumps(list(index), protocol=pickle.HIGHEST_PROTOCOL)
+
+    #--------------------------------------------------------------------------
+    # Ostatne typy
+    #--------------------------------------------------------------------------
+    if typ == 'obj': parts['data'] = pickle.dumps(list(vals), protocol=pickle.HIGHEST_PROTOCOL)
+
+    return (schema, parts)
+
+#------------------------------------------------------------------------------
+def saveColumnar(fileName, rows, columns=None):
+    "Atomically saves list of dicts in columnar format, columns default to keys of all rows. Returns number of rows"
+
+    rows = rows if isinstance(rows, list) else list(rows)
+
+    if columns is None: columns = list(dict.fromkeys(key for row in rows for key in row))
+
+    schema = {'version':_COL_VER, 'rows':len(rows), 'columns':[]}
+
+    with SiqoAtomicWriter(fileName, 'wb') as file:
+
+        file.write(_MAGIC)
+        pos = len(_MAGIC)
+
+        #----------------------------------------------------------------------
+        # Bloky stlpcov zarovnane na _ALIGN bajtov
+        #----------------------------------------------------------------------
+        for name in columns:
+
+            (col, parts) = _encode([row.get(name) for row in rows])
+            col['name'] = name
+
+            for part, data in parts.items():
+
+                pad  = -pos % _ALIGN
+                file.write(b'\0' * pad)
+                pos += pad
+
+                col[part] = [pos, len(data)]
+                file.write(data)
+                pos += len(data)
+
+            schema['columns'].append(col)
+
+        #----------------------------------------------------------------------
+        # Schema na konci, jej poloha v paticke
+        #----------------------------------------------------------------------
+        head = json.dumps(schema).encode('utf-8')
+
+        file.write(head)
+        file.write(_TAIL.pack(pos, len(head), _MAGIC))
+
+    return len(rows)
+
+#==============================================================================
+# SiqoColumnar
+#------------------------------------------------------------------------------
+class SiqoColumnar:
+    """
+    Reader of the columnar cache. The file is memory-mapped and only the
+    schema is parsed on open. Columns are decoded on demand: numeric columns
+    are zero-copy numpy views (array), python values are produced per column
+    (column) or per block of rows (rows), so only selected columns and the
+    current block are converted to python objects. Keys missing in a saved
+    row are loaded as None.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, fileName, useMmap=True):
+        "Call constructor of SiqoColumnar and read the schema"
+
+        self.map  = None        # mmap suboru, subor sa po namapovani hned zavrie
+
+        with open(fileName, 'rb') as file:
+
+            if useMmap: self.map  = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else      : self.view = memoryview(file.read())
+
+        if self.map is not None: self.view = memoryview(self.map)
+
+        if len(self.view) < len(_MAGIC) + _TAIL.size or self.view[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f'SIQO.SiqoColumnar: {fileName} is not a columnar file')
+
+        (pos, length, magic) = _TAIL.unpack(self.view[-_TAIL.size:])
+        if magic != _MAGIC: raise ValueError(f'SIQO.SiqoColumnar: {fileName} is not a columnar file')
+
+        schema = json.loads(bytes(self.view[pos:pos + length]))
+        if schema['version'] > _COL_VER: raise ValueError(f"SIQO.SiqoColumnar: {fileName} has unsupported version {schema['version']}")
+
+        self.fileName = fileName                                      # Meno suboru
+        self.count    = schema['rows']                                # Pocet riadkov
+        self.meta     = {col['name']: col for col in schema['columns']}
+        self.columns  = list(self.meta)                               # Nazvy stlpcov v poradi
+        self._dicts   = {}                                            # Dekodovane slovniky stringov
+        self._objs    = {}                                            # Dekodovane obj stlpce
+
+    #--------------------------------------------------------------------------
+    def _part(self, block, code, start, stop):
+        "Returns numpy view or list of the typed block for rows <start, stop)"
+
+        size  = array(code).itemsize
+        first = block[0] + start * size
+
+        if np is not None: return np.frombuffer(self.view, _DTYPES[code], count=stop - start, offset=first)
+
+        toRet = array(code)
+        toRet.frombytes(self.view[first:first + (stop - start) * size])
+        if sys.byteorder == 'big': toRet.byteswap()
+
+        return toRet.tolist()
+
+    #--------------------------------------------------------------------------
+    def _dict(self, name):
+        "Returns unique strings of str column followed by None, numpy object array if numpy is available"
+
+        toRet = self._dicts.get(name)
+
+        if toRet is None:
+
+            col   = self.meta[name]
+            toRet = pickle.loads(self.view[col['dict'][0]:col['dict'][0] + col['dict'][1]])
+
+            # Kod -1 ukazuje na posledny prvok
+            toRet.append(None)
+            if np is not None: toRet = np.array(toRet, dtype=object)
+
+            self._dicts[name] = toRet
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def _slice(self, name, start, stop):
+        "Returns python values of the column for rows <start, stop)"
+
+        col = self.meta[name]
+        typ = col['type']
+
+        if typ == 'none': return [None] * (stop - start)
+
+        #----------------------------------------------------------------------
+        # Pickle stlpec dekodujem cely raz
+        #----------------------------------------------------------------------
+        if typ == 'obj':
+
+            if name not in self._objs:
+                self._objs[name] = pickle.loads(self.view[col['data'][0]:col['data'][0] + col['data'][1]])
+
+            return self._objs[name][start:stop]
+
+        #----------------------------------------------------------------------
+        # String podla slovnika
+        #----------------------------------------------------------------------
+        if typ == 'str':
+
+            codes = self._part(col['data'], 'i', start, stop)
+            uniq  = self._dict(name)
+
+            if np is not None: return uniq[codes].tolist()
+            return [uniq[code] for code in codes]
+
+        #----------------------------------------------------------------------
+        # Cisla a bool, None podla masky
+        #----------------------------------------------------------------------
+        vals = self._part(col['data'], _CODES[typ], start, stop)
+
+        if np is not None:
+            vals = vals.astype(bool).tolist() if typ == 'bool' else vals.tolist()
+
+        elif typ == 'bool': vals = [bool(val) for val in vals]
+
+        if 'nulls' in col:
+            nulls = self.view[col['nulls'][0] + start:col['nulls'][0] + stop]
+            vals  = [None if null else val for val, null in zip(vals, nulls)]
+
+        return vals
+
+    #--------------------------------------------------------------------------
+    def __enter__(self):
+
+        return self
+
+    #--------------------------------------------------------------------------
+    def __exit__(self, excType, excVal, excTb):
+
+        self.close()
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+
+        return self.count
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, i):
+
+        if i < 0: i += self.count
+        if not 0 <= i < self.count: raise IndexError(f'SiqoColumnar: row {i} out of range')
+
+        return {name: self._slice(name, i, i + 1)[0] for name in self.columns}
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+
+        return self.rows()
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def array(self, name):
+        "Returns numpy view of int, float or bool column without copying, None values are 0 or NaN"
+
+        col = self.meta[name]
+
+        if np is None or col['type'] not in _CODES: raise TypeError(f"SIQO.SiqoColumnar: Column {name} of type {col['type']} has no numpy view")
+
+        return self._part(col['data'], _CODES[col['type']], 0, self.count)
+
+    #--------------------------------------------------------------------------
+    def column(self, name):
+        "Returns list of python values of the column"
+
+        return self._slice(name, 0, self.count)
+
+    #--------------------------------------------------------------------------
+    def rows(self, columns=None, start=0, stop=None):
+        "Yields rows as dicts with selected columns, decoded in blocks of rows"
+
+        if columns is None: columns = self.columns
+        if stop    is None: stop    = self.count
+
+        for pos in range(start, stop, _BLOCK):
+
+            end  = min(pos + _BLOCK, stop)
+            vals = [self._slice(name, pos, end) for name in columns]
+
+            yield from [dict(zip(columns, row)) for row in zip(*vals)]
+
+    #--------------------------------------------------------------------------
+    def toList(self, columns=None):
+        "Returns list of dicts with selected columns"
+
+        return list(self.rows(columns))
+
+    #--------------------------------------------------------------------------
+    def close(self):
+        "Releases the map, numpy views from array() keep it open until they are deleted"
+
+        self._dicts = {}
+        self._objs  = {}
+
+        try:
+            self.view.release()
+            if self.map is not None: self.map.close()
+
+        # Na mapu ukazuju numpy pohlady, zavrie sa az s nimi
+        except BufferError: pass
+
+        self.map = None
+
+#------------------------------------------------------------------------------
+def loadColumnar(fileName, columns=None, useMmap=True):
+    "Returns list of dicts with selected columns from columnar file"
+
+    with SiqoColumnar(fileName, useMmap) as cols: return cols.toList(columns)
+
+#==============================================================================
+# Columnar cache
+#------------------------------------------------------------------------------
+print(f'SIQO columnar library ver {_VER}')
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
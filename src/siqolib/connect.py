@@ -8,6 +8,7 @@ import pytz
 
 from   datetime      import datetime, timedelta
 from   siqo_hosts    import hosts
+from   jsoncache     import thaw
 
 env = 'localPython'
 hst = 'PC'
@@ -183,16 +184,18 @@ class SiqoConnect:
         "Saves current connects configuration"
 
         journal.I('{}.saveConf'.format('SiqoConnect'))
-        gen.dumpJson(journal, CONNECTS_CONF, SiqoConnect.conf)
+        gen.dumpJson(CONNECTS_CONF, thaw(SiqoConnect.conf))
         journal.O('')
 
     #--------------------------------------------------------------------------
     @staticmethod
     def loadConf(journal):
-        "Loads current connects configuration"
+        "Loads current connects configuration, parsed file is cached until it changes"
 
         journal.I('{}.loadConf'.format('SiqoConnect'))
-        SiqoConnect.conf = gen.loadJson(journal, CONNECTS_CONF)
+
+        # Cache zdielaju vsetci citatelia, preto iba na citanie. Na zmenu treba kopiu cez thaw
+        SiqoConnect.conf = gen.loadJson(CONNECTS_CONF, cached=True, frozen=True)
         journal.O('')
 
     #==========================================================================
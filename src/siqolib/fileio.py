@@ -0,0 +1,443 @@
+#==============================================================================
+# Siqo file input/output library
+#------------------------------------------------------------------------------
+import io
+import os
+import sys
+import csv
+import gzip
+import mmap
+import json
+import tempfile
+from   array              import array
+from   itertools          import islice
+
+from   jsoncodec          import SiqoJsonCodec
+
+try   : import numpy as np
+except ImportError: np = None
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_BUF_SIZE   = 1 << 20    # Velkost buffera pri citani suboru
+_SCAN_SIZE  = 1 << 26    # Velkost bloku pri hladani koncov riadkov v mmap
+_BATCH      = 1024       # Pocet riadkov zapisanych jednym writelines
+_GZIP_LEVEL = 6          # Uroven kompresie gzip, 9 je vyrazne pomalsia
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Utilities
+#------------------------------------------------------------------------------
+def _openTmp(dirName, baseName):
+    "Returns (fd, name) of a new temporary file in dirName created with 0666 permissions limited by umask"
+
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0)
+
+    # Na rozdiel od mkstemp (0600) uplatni umask priamo kernel, nemusim ho citat
+    for _ in range(tempfile.TMP_MAX):
+
+        name = os.path.join(dirName, f'.{baseName}.{os.urandom(6).hex()}.tmp')
+
+        try   : return (os.open(name, flags, 0o666), name)
+        except FileExistsError: continue
+
+    raise FileExistsError(f'SIQO._openTmp: No usable temporary file name in {dirName}')
+
+#==============================================================================
+# Lazy line reader
+#------------------------------------------------------------------------------
+def iterLines(fileName, enc='utf-8', bufSize=_BUF_SIZE):
+    "Yields lines of the file without '\\n' one by one, reading with buffer of bufSize bytes"
+
+    #--------------------------------------------------------------------------
+    # Ak file NEexistuje
+    #--------------------------------------------------------------------------
+    if not os.path.exists(fileName):
+        print(f'SIQO.iterLines: ERROR File {fileName} does not exist')
+        return
+
+    #--------------------------------------------------------------------------
+    # Ak file existuje
+    #--------------------------------------------------------------------------
+    i = 0
+
+    try:
+        with open(fileName, encoding=enc, buffering=bufSize) as file:
+
+            for line in file:
+                yield line.replace('\n', '')
+                i += 1
+
+        print(f'SIQO.iterLines: From {fileName} was loaded {i} lines')
+
+    except Exception as err:
+        print(f'SIQO.iterLines: {fileName} ERROR {str(err)} after {i} lines')
+
+#==============================================================================
+# SiqoLineIndex
+#------------------------------------------------------------------------------
+class SiqoLineIndex:
+    """
+    Memory-mapped text file with an index of line offsets. The index is built
+    in one pass over the mapped bytes, then any line or range of lines is
+    decoded on demand without loading the file. Line ends are searched as
+    b'\\n', so the encoding has to be ASCII compatible (utf-8, cp1250, ...).
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, fileName, enc='utf-8'):
+        "Call constructor of SiqoLineIndex, map the file and build the line index"
+
+        self.fileName = fileName    # Meno suboru
+        self.enc      = enc         # Kodovanie suboru
+        self.file     = None        # Otvoreny subor
+        self.map      = None        # mmap suboru
+        self.starts   = []          # Offsety zaciatkov riadkov
+        self.size     = 0           # Velkost suboru v bajtoch
+
+        #----------------------------------------------------------------------
+        # Ak file NEexistuje
+        #----------------------------------------------------------------------
+        if not os.path.exists(fileName):
+            print(f'SIQO.SiqoLineIndex: ERROR File {fileName} does not exist')
+            return
+
+        #----------------------------------------------------------------------
+        # Ak file existuje
+        #----------------------------------------------------------------------
+        try:
+            self.file = open(fileName, 'rb')
+            self.size = os.fstat(self.file.fileno()).st_size
+
+            # Prazdny subor sa neda namapovat
+            if self.size > 0:
+                self.map    = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.starts = self._index()
+
+            print(f'SIQO.SiqoLineIndex: {fileName} has {len(self)} lines')
+
+        except Exception as err:
+            print(f'SIQO.SiqoLineIndex: {fileName} ERROR {str(err)}')
+            self.close()
+
+    #--------------------------------------------------------------------------
+    def _index(self):
+        "Returns offsets of line starts found in the mapped file"
+
+        mm = self.map
+
+        #----------------------------------------------------------------------
+        # Numpy, po blokoch aby porovnanie nealokovalo pole velkosti suboru
+        #----------------------------------------------------------------------
+        if np is not None:
+
+            parts = [np.zeros(1, dtype=np.int64)]
+
+            for pos in range(0, self.size, _SCAN_SIZE):
+
+                block = np.frombuffer(mm, np.uint8, count=min(_SCAN_SIZE, self.size - pos), offset=pos)
+                parts.append(np.flatnonzero(block == 10).astype(np.int64) + pos + 1)
+
+            toRet = np.concatenate(parts)
+
+        #----------------------------------------------------------------------
+        # Cisty python
+        #----------------------------------------------------------------------
+        else:
+
+            toRet = array('q', [0])
+            pos   = mm.find(b'\n')
+
+            while pos >= 0:
+                toRet.append(pos + 1)
+                pos = mm.find(b'\n', pos + 1)
+
+        # Za poslednym '\n' uz nie je riadok
+        if toRet[-1] == self.size: toRet = toRet[:-1]
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def _end(self, i):
+        "Returns offset of the end of line i"
+
+        return self.starts[i + 1] if i + 1 < len(self.starts) else self.size
+
+    #--------------------------------------------------------------------------
+    def _decode(self, raw):
+        "Returns decoded line without line end"
+
+        if raw.endswith(b'\n'  ): raw = raw[:-1]
+        if raw.endswith(b'\r'  ): raw = raw[:-1]
+
+        return raw.decode(self.enc)
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+
+        return len(self.starts)
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, key):
+
+        if isinstance(key, slice):
+
+            start, stop, step = key.indices(len(self))
+
+            if step == 1: return self.lines(start, stop)
+            return [self[i] for i in range(start, stop, step)]
+
+        if key < 0: key += len(self)
+        if not 0 <= key < len(self): raise IndexError(f'SiqoLineIndex: line {key} out of range')
+
+        return self._decode(self.map[self.starts[key]:self._end(key)])
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+
+        return self.iterLines()
+
+    #--------------------------------------------------------------------------
+    def __enter__(self):
+
+        return self
+
+    #--------------------------------------------------------------------------
+    def __exit__(self, excType, excVal, excTb):
+
+        self.close()
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def lines(self, start, stop):
+        "Returns list of lines in range <start, stop), the range is read as one block"
+
+        start = max(start, 0)
+        stop  = min(stop, len(self))
+
+        if start >= stop: return []
+
+        block = self.map[self.starts[start]:self._end(stop - 1)].decode(self.enc)
+        toRet = block.split('\n')
+
+        # Posledny riadok s '\n' na konci vytvori prazdny prvok
+        if block.endswith('\n'): toRet.pop()
+
+        return [line[:-1] if line.endswith('\r') else line for line in toRet]
+
+    #--------------------------------------------------------------------------
+    def iterLines(self, start=0, stop=None, step=10000):
+        "Yields lines in range <start, stop) decoded in blocks of step lines"
+
+        if stop is None: stop = len(self)
+
+        for pos in range(start, stop, step): yield from self.lines(pos, min(pos + step, stop))
+
+    #--------------------------------------------------------------------------
+    def close(self):
+        "Closes the map and the file"
+
+        if self.map  is not None: self.map.close()
+        if self.file is not None: self.file.close()
+
+        self.map  = None
+        self.file = None
+
+#==============================================================================
+# SiqoAtomicWriter
+#------------------------------------------------------------------------------
+class SiqoAtomicWriter:
+    """
+    Context manager writing into a temporary file in the target directory.
+    On success the data is flushed, fsync-ed and the temporary file is renamed
+    over the target, so readers see either the old or the complete new file.
+    On exception the temporary file is removed and the target stays untouched.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, fileName, mode='w', enc='utf-8', bufSize=_BUF_SIZE):
+        "Call constructor of SiqoAtomicWriter, mode is 'w' for text or 'wb' for bytes"
+
+        self.fileName = os.path.abspath(fileName)   # Cielovy subor
+        self.mode     = mode                        # Mod zapisu 'w' alebo 'wb'
+        self.enc      = enc                         # Kodovanie pre textovy mod
+        self.bufSize  = bufSize                     # Velkost buffera zapisu
+        self.tmpName  = None                        # Docasny subor
+        self.file     = None                        # Otvoreny docasny subor
+
+    #--------------------------------------------------------------------------
+    def __enter__(self):
+
+        dirName, baseName = os.path.split(self.fileName)
+
+        fd, self.tmpName = _openTmp(dirName, baseName)
+
+        #----------------------------------------------------------------------
+        # Prava ponecham z povodneho suboru, novy subor ma prava 0666 podla umask
+        #----------------------------------------------------------------------
+        try   : os.chmod(self.tmpName, os.stat(self.fileName).st_mode & 0o7777)
+        except FileNotFoundError: pass
+
+        if 'b' in self.mode: self.file = os.fdopen(fd, self.mode, buffering=self.bufSize)
+        else               : self.file = os.fdopen(fd, self.mode, buffering=self.bufSize, encoding=self.enc)
+
+        return self.file
+
+    #--------------------------------------------------------------------------
+    def __exit__(self, excType, excVal, excTb):
+
+        #----------------------------------------------------------------------
+        # Chyba, docasny subor zmazem
+        #----------------------------------------------------------------------
+        if excType is not None:
+
+            self.file.close()
+            os.remove(self.tmpName)
+            return False
+
+        #----------------------------------------------------------------------
+        # Data na disk, potom premenovanie a fsync adresara
+        #----------------------------------------------------------------------
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+        os.replace(self.tmpName, self.fileName)
+
+        if sys.platform != 'win32':
+
+            fd = os.open(os.path.dirname(self.fileName), os.O_RDONLY)
+            try    : os.fsync(fd)
+            finally: os.close(fd)
+
+        return False
+
+#------------------------------------------------------------------------------
+def _batches(items, batch):
+    "Yields lists of batch items from iterable"
+
+    it = iter(items)
+
+    while True:
+        chunk = list(islice(it, batch))
+        if not chunk: return
+        yield chunk
+
+#------------------------------------------------------------------------------
+def writeLines(fileName, lines, enc='utf-8', bufSize=_BUF_SIZE, batch=_BATCH):
+    "Atomically writes iterable of strings into the file with batched writelines, returns number of lines"
+
+    toRet = 0
+
+    with SiqoAtomicWriter(fileName, 'w', enc, bufSize) as file:
+
+        for chunk in _batches(lines, batch):
+            file.writelines(chunk)
+            toRet += len(chunk)
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def writeJson(fileName, data, enc='utf-8', compact=False, indent=6, bufSize=_BUF_SIZE, batch=_BATCH):
+    "Atomically writes data as JSON, compact mode writes by the fastest JSON backend without indent and spaces"
+
+    #--------------------------------------------------------------------------
+    # Kompaktny JSON zakodujem naraz rychlym backendom
+    #--------------------------------------------------------------------------
+    if compact:
+
+        with SiqoAtomicWriter(fileName, 'w', enc, bufSize) as file: file.write(SiqoJsonCodec().dumps(data))
+        return
+
+    #--------------------------------------------------------------------------
+    # Formatovany JSON po castiach
+    #--------------------------------------------------------------------------
+    encoder = json.JSONEncoder(indent=indent)
+
+    with SiqoAtomicWriter(fileName, 'w', enc, bufSize) as file:
+
+        for chunk in _batches(encoder.iterencode(data), batch): file.write(''.join(chunk))
+
+#------------------------------------------------------------------------------
+def writeCsv(fileName, rows, header=None, enc='utf-8', delimiter=',', compress=None, bufSize=_BUF_SIZE, batch=_BATCH):
+    """
+    Atomically streams iterable of dicts or lists into CSV, gzip if compress
+    or fileName ends with .gz. Returns number of rows. Header of dicts
+    defaults to union of keys of all rows for a list, to keys of the first
+    row for other iterables. A dict with a key not in the header raises
+    ValueError and the file is not changed.
+    """
+
+    if compress is None: compress = fileName.endswith('.gz')
+
+    it    = iter(rows)
+    first = next(it, None)
+    toRet = 0
+
+    #--------------------------------------------------------------------------
+    # Hlavicka z explicitneho zoznamu, zo vsetkych klucov zoznamu alebo z klucov prveho dict
+    #--------------------------------------------------------------------------
+    if header is None and isinstance(first, dict):
+
+        if isinstance(rows, (list, tuple)): header = list(dict.fromkeys(key for row in rows for key in row))
+        else                              : header = list(first.keys())
+
+    keys = set(header) if header is not None else set()
+
+    with SiqoAtomicWriter(fileName, 'wb', bufSize=bufSize) as raw:
+
+        stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=_GZIP_LEVEL) if compress else raw
+        text   = io.TextIOWrapper(stream, encoding=enc, newline='')
+        writer = csv.writer(text, delimiter=delimiter, lineterminator='\n')
+
+        if header is not None: writer.writerow(header)
+
+        #----------------------------------------------------------------------
+        # Riadky zapisujem po davkach, dict prevediem na zoznam podla hlavicky
+        #----------------------------------------------------------------------
+        if first is not None:
+
+            for chunk in _batches(_chain(first, it), batch):
+
+                if isinstance(chunk[0], dict):
+
+                    # Kluce mimo hlavicky by sa stratili, rovnako ako csv.DictWriter to je chyba
+                    for row in chunk:
+                        if not row.keys() <= keys: raise ValueError(f'SIQO.writeCsv: Row contains fields not in header: {sorted(map(str, row.keys() - keys))}')
+
+                    chunk = [[row.get(key) for key in header] for row in chunk]
+
+                writer.writerows(chunk)
+                toRet += len(chunk)
+
+        text.detach()
+        if compress: stream.close()
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def _chain(first, it):
+    "Yields first and then the rest of the iterator"
+
+    yield first
+    yield from it
+
+#==============================================================================
+# File input/output
+#------------------------------------------------------------------------------
+print(f'SIQO fileio library ver {_VER}')
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
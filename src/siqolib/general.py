@@ -17,6 +17,10 @@ _VER      = '1.20'
 
 _TIF_BASE  = date    (1971, 12, 31)
 _TIF_TIME  = datetime(1971, 12, 31, 0, 0, 0)
+_TIF_ORD   = _TIF_BASE.toordinal()                     # Ordinal of ADAT 0 for fast date <-> ADAT arithmetic
+_TIF_UNIX  = _TIF_ORD - date(1970, 1, 1).toordinal()   # ADAT 0 in days since numpy/unix epoch
+_TIF_DAY   = 24*60*60                                  # Pocet sekund v dni
+_BUF_SIZE  = 1 << 20                                   # Velkost buffera pri citani a zapise suborov
 
 test_time = time.localtime()
 
@@ -28,6 +32,7 @@ TIME_FORMAT = '%Y.%m.%d %H:%M:%S'
 #==============================================================================
 # package's variables
 #------------------------------------------------------------------------------
+np = False                 # numpy sa importuje az pri prvom pouziti, None ak nie je nainstalovany
 
 #==============================================================================
 # Datetime tools
@@ -63,6 +68,100 @@ def tifToChar(adat, dec=True):
     if dec: return tifToDate(adat).strftime(r'%H:%M:%S' )
     else  : return tifToDate(adat).strftime(r'%Y.%m.%d.')
 
+#------------------------------------------------------------------------------
+# Batch datetime tools for columns (list, array.array or numpy array)
+#------------------------------------------------------------------------------
+def _numpy():
+    "Returns numpy imported at first use (import general stays fast) or None if it is not installed"
+
+    global np
+
+    if np is False:
+        try   : import numpy as np
+        except ImportError: np = None
+
+    return np
+
+#------------------------------------------------------------------------------
+def datesToTif(dats):
+    "Returns ADAT values for column of dates/datetimes. Returns numpy int64 array if numpy is available, list otherwise"
+
+    np = _numpy()
+
+    #--------------------------------------------------------------------------
+    # Numpy datetime64 stlpec prevediem vektorovo
+    #--------------------------------------------------------------------------
+    if np is not None and isinstance(dats, np.ndarray) and dats.dtype.kind == 'M':
+
+        days = dats.astype('datetime64[D]').astype(np.int64)
+        return days - _TIF_UNIX
+
+    #--------------------------------------------------------------------------
+    # Ostatne stlpce prevediem cez ordinal, datetime.toordinal() ignoruje cas
+    #--------------------------------------------------------------------------
+    try:
+        toRet = [dat.toordinal() - _TIF_ORD for dat in dats]
+
+    except AttributeError:
+        raise TypeError("datesToTif: Expected column of date or datetime.date values")
+
+    if np is not None: return np.array(toRet, dtype=np.int64)
+    return toRet
+
+#------------------------------------------------------------------------------
+def datesToTifPart(dts):
+    "Returns tif.part_of_day values for column of datetimes, numpy float64 array if numpy is available"
+
+    np = _numpy()
+
+    #--------------------------------------------------------------------------
+    # Numpy datetime64 stlpec prevediem vektorovo s rozlisenim na sekundy
+    #--------------------------------------------------------------------------
+    if np is not None and isinstance(dts, np.ndarray) and dts.dtype.kind == 'M':
+
+        secs = dts.astype('datetime64[s]').astype(np.int64) - _TIF_UNIX * _TIF_DAY
+        days, sods = np.divmod(secs, _TIF_DAY)
+
+        return days + sods / _TIF_DAY
+
+    #--------------------------------------------------------------------------
+    # Ostatne stlpce rovnako ako dateToTifPart, t.j. bez mikrosekund
+    #--------------------------------------------------------------------------
+    toRet = [dt.toordinal() - _TIF_ORD + (dt.hour*3600 + dt.minute*60 + dt.second) / _TIF_DAY for dt in dts]
+
+    if np is not None: return np.array(toRet, dtype=np.float64)
+    return toRet
+
+#------------------------------------------------------------------------------
+def tifsToDate(adats):
+    "Returns naive dates for column of ADAT values. Numpy datetime64 array if numpy is available, list of date/datetime otherwise"
+
+    np = _numpy()
+
+    #--------------------------------------------------------------------------
+    # Vektorovy prevod cez numpy
+    #--------------------------------------------------------------------------
+    if np is not None:
+
+        arr  = np.asarray(adats)
+        base = np.datetime64(_TIF_BASE, 'D')
+
+        # Cele ADAT su dni, desatinne ADAT maju aj cas dna
+        if arr.dtype.kind in 'iu': return base + arr.astype('timedelta64[D]')
+        else                     : return base + np.round(arr * _TIF_DAY * 1e6).astype(np.int64).astype('timedelta64[us]')
+
+    #--------------------------------------------------------------------------
+    # Pure python prevod
+    #--------------------------------------------------------------------------
+    toRet = []
+
+    for adat in adats:
+
+        if isinstance(adat, int): toRet.append(date.fromordinal(_TIF_ORD + int(adat)))
+        else                    : toRet.append(_TIF_TIME + timedelta(days=adat))
+
+    return toRet
+
 #==============================================================================
 # Json tools
 #------------------------------------------------------------------------------
@@ -450,18 +549,8 @@ def strXor(s1, s2):
         key  = s1
 
     lenKey = len(key)
-    pos    = 0
-
-    toRet = ''
-
-    for ch in text:
 
-        n1 = ord(ch)
-        n2 = ord(key[pos%lenKey])
-
-        toRet = toRet + chr(n1^n2)
-
-        pos += 1
+    toRet = ''.join([chr(ord(ch) ^ ord(key[pos%lenKey])) for pos, ch in enumerate(text)])
 
     return toRet
 
@@ -480,9 +569,7 @@ def strFibbMod(s, state=382362):
 #------------------------------------------------------------------------------
 def strOrder(s, order):
 
-    toRet = ''
-
-    for pos in order: toRet += s[pos]
+    toRet = ''.join([s[pos] for pos in order])
 
     return toRet
 
@@ -507,37 +594,43 @@ def strSalted(s, state=None):
 #------------------------------------------------------------------------------
 def strWatermark(s1, s2):
 
-    toRet = ''
+    toRet = []
     lenS2 = len(s2)
 
-    p1 = 0
+    for p1, ch in enumerate(s1):
 
-    for ch in s1:
-
-        n1 = ord(ch)     # Pozicia v s1
+        n1 = ord(ch)     # Kod znaku v s1
         p2 = p1%lenS2    # Pozicia v s2
 
-        if 3*(n1%(p2+1)) > lenS2: toRet += s2[p2]
-        else                    : toRet += ch
-
-        p1 += 1
+        if 3*(n1%(p2+1)) > lenS2: toRet.append(s2[p2])
+        else                    : toRet.append(ch)
 
-    return toRet
+    return ''.join(toRet)
 
 #==============================================================================
 # Persistency Tools
 #------------------------------------------------------------------------------
 def lines2str(lines, delim='\n'):
 
-    toRet = ''
-
-    for line in lines:
-        toRet = toRet + line + delim
+    toRet = ''.join([line + delim for line in lines])
 
     return toRet
 
 #------------------------------------------------------------------------------
-def loadFile(fileName, enc='utf-8'):
+def loadFile(fileName, enc='utf-8', lazy=False, bufSize=_BUF_SIZE, mmap=False):
+    """
+    Returns list of lines of the file. If lazy returns iterator yielding lines
+    one by one. If mmap returns fileio.SiqoLineIndex, the memory-mapped file
+    with random access to lines (len, [i], [i:j]) that should be closed.
+    """
+
+    if mmap:
+        from fileio import SiqoLineIndex
+        return SiqoLineIndex(fileName, enc)
+
+    if lazy:
+        from fileio import iterLines
+        return iterLines(fileName, enc, bufSize)
 
     toRet = []
 
@@ -564,17 +657,36 @@ def loadFile(fileName, enc='utf-8'):
     return toRet
 
 #------------------------------------------------------------------------------
-def saveFile(fileName, lines, enc='utf-8'):
+def loadFiles(paths, enc='utf-8', workers=None, processes=None):
+    "Loads files concurrently, returns {path: {res, dat, msg, time}}. See loader.loadFiles"
+
+    from loader import loadFiles, _WORKERS
+
+    return loadFiles(paths, enc, workers or _WORKERS, processes)
+
+#------------------------------------------------------------------------------
+def saveFile(fileName, lines, enc='utf-8', bufSize=_BUF_SIZE):
+    "Atomically saves lines into the file, a crash leaves the previous content"
 
-    with open(fileName, 'w', encoding=enc) as file:
+    from fileio import writeLines
 
-        for line in lines:
-            file.write(line)
+    writeLines(fileName, lines, enc, bufSize)
 
     print(f'SIQO.saveFile: File {fileName} was saved')
 
 #------------------------------------------------------------------------------
-def loadJson(fileName, enc='utf-8'):
+def loadJson(fileName, enc='utf-8', lazy=False, path=(), cached=False, frozen=False):
+    "Returns parsed JSON file, if lazy returns iterator yielding elements of the array at path one by one. Cached object is shared, frozen makes it read-only"
+
+    if lazy:
+        from jsonstream import iterArray
+        return iterArray(fileName, path, enc)
+
+    if cached:
+        from jsoncache import SiqoJsonCache
+        return SiqoJsonCache().get(fileName, enc, frozen)
+
+    from jsoncodec import SiqoJsonCodec
 
     toret = None
 
@@ -584,8 +696,7 @@ def loadJson(fileName, enc='utf-8'):
     if os.path.exists(fileName):
 
         try:
-            with open(fileName, encoding=enc) as file:
-                toret = json.load(file)
+            toret = SiqoJsonCodec().load(fileName, enc)
 
             print('SIQO.loadJson: From {} was loaded {} entries'.format(fileName, len(toret)))
 
@@ -601,12 +712,13 @@ def loadJson(fileName, enc='utf-8'):
     return toret
 
 #------------------------------------------------------------------------------
-def dumpJson(fileName, data, enc='utf-8'):
+def dumpJson(fileName, data, enc='utf-8', compact=False):
+    "Atomically saves data as JSON, pretty-printed or compact"
+
+    from fileio import writeJson
 
     try:
-        file = open(fileName, "w", encoding=enc)
-        json.dump(data, file, indent = 6)
-        file.close()
+        writeJson(fileName, data, enc, compact)
 
         print('SIQO.dumpJson: {} saved'.format(fileName))
 
@@ -614,28 +726,44 @@ def dumpJson(fileName, data, enc='utf-8'):
         print('SIQO.dumpJson: {} ERROR {}'.format(fileName, str(err)), True)
 
 #------------------------------------------------------------------------------
-def dumpCsv(fileName, data):
+def dumpCsv(fileName, data, enc='utf-8', header=None, compress=None):
+    "Atomically streams iterable of dicts or lists into CSV file, gzip for *.gz. Header defaults to all keys of a list, see fileio.writeCsv"
 
-    df = pd.DataFrame(data)
-    df.to_csv(fileName, index=False)
+    from fileio import writeCsv
 
-    print('SIQO.dumpCsv: {} saved'.format(fileName))
+    try:
+        rows = writeCsv(fileName, data, header, enc, compress=compress)
+        print('SIQO.dumpCsv: {} saved {} rows'.format(fileName, rows))
+
+    except Exception as err:
+        print('SIQO.dumpCsv: {} ERROR {}'.format(fileName, str(err)), True)
 
 #------------------------------------------------------------------------------
-def picObj(fileName, obj):
+def picObj(fileName, obj, snapshot=False, compress=None):
+    "Saves obj by the highest pickle protocol, or as a snapshot with out-of-band buffers, checksum and optional compression"
 
-    dbfile = open(fileName, 'wb')
-    pickle.dump(obj, dbfile)
-    dbfile.close()
+    if snapshot:
+        from snapshot import saveSnapshot
+        saveSnapshot(fileName, obj, compress)
+
+    else:
+        dbfile = open(fileName, 'wb')
+        pickle.dump(obj, dbfile, protocol=pickle.HIGHEST_PROTOCOL)
+        dbfile.close()
 
     print('SIQO.picObj: {} saved'.format(fileName))
 
 #------------------------------------------------------------------------------
-def unPicObj(fileName):
+def unPicObj(fileName, useMmap=True):
+    "Returns object from pickle or snapshot file, snapshot buffers are memory mapped if useMmap"
 
-    dbfile = open(fileName, 'rb')
-    obj = pickle.load(dbfile)
-    dbfile.close()
+    from snapshot import loadSnapshot, isSnapshot
+
+    if isSnapshot(fileName): obj = loadSnapshot(fileName, useMmap)
+    else:
+        dbfile = open(fileName, 'rb')
+        obj = pickle.load(dbfile)
+        dbfile.close()
 
     print('SIQO.unPicObj: {} loaded'.format(fileName))
     return obj
@@ -824,107 +952,30 @@ def listSort(lst, sortKey=None, reverse=False):
 
 #------------------------------------------------------------------------------
 def listToDic(lst, keyLst=[]):
-    "Returns list converted into dict with respective keys"
-
-    toRet = {}
-    i     = 0
-
-    #--------------------------------------------------------------------------
-    # Prejdem vsetky polozky v zozname
-    #--------------------------------------------------------------------------
-    for item in lst:
-
-        # Vytvorim kluc
-        keyStr = ''
-        for key in keyLst: keyStr += str(item[key])
-
-        # Vlozim item do dict pod klucom
-        if keyStr not in toRet.keys(): toRet[keyStr] = []
+    "Returns list converted into dict {tuple of key values: [items]} and number of items"
 
-        toRet[keyStr].append(item)
+    from rowindex import SiqoRowIndex
 
-        i += 1
+    index = SiqoRowIndex(lst, keyLst)
 
     #--------------------------------------------------------------------------
-    return (toRet, i)
+    return (index.index, index.rows)
 
 #------------------------------------------------------------------------------
-def listDicComp(refLst, tstLst, keyLst):
-    "Returns differences between lists of Dictionaries"
-
-    toRet = {'missingInTst':{}, 'extraInTst':{}, 'differ':{}}
-
-    (refDic, refI) = listToDic(refLst, keyLst)
-    (tstDic, tstI) = listToDic(tstLst, keyLst)
-
-    #--------------------------------------------------------------------------
-    # Prejdem vsetky polozky v Ref
-    #--------------------------------------------------------------------------
-    for refKey, ref in refDic.items():
-
-        # Skontrolujem, ci sa nachadza aj v tst
-        if refKey in tstDic.keys():
-
-            pass
+def listDicComp(refLst, tstLst, keyLst, columns=None, ignore=()):
+    "Returns differences between lists of Dictionaries, lists may be given as SiqoRowIndex. See rowdiff.rowDiff"
 
- #           diff = dicDiffer(ref, tstDic[refKey])
-
-            # Skontrolujem, ci su rovnake hodnoty
- #           if len(diff) > 0:
-
- #               if refKey not in toRet['differ'].keys(): toRet['differ'][refKey] = []
- #               toRet['differ'][refKey].append(diff)
-
-        else:
+    from rowdiff import rowDiff
 
-#            if refKey not in toRet['missingInTst'].keys(): toRet['missingInTst'][refKey] = []
-#            toRet['missingInTst'][refKey].append(ref)
-            toRet['missingInTst'][refKey] = ref
-
-    #--------------------------------------------------------------------------
-    # Prejdem vsetky polozky v Tst
-    #--------------------------------------------------------------------------
-    for tstKey, tst in tstDic.items():
-
-        # Skontrolujem, ci sa nachadza aj v ref
-        if tstKey not in refDic.keys():
-
-#            if tstKey not in toRet['extraInTst'].keys(): toRet['extraInTst'][tstKey] = []
-#            toRet['extraInTst'][tstKey].append(tst)
-            toRet['extraInTst'][tstKey] = tst
-
-    #--------------------------------------------------------------------------
-    return toRet
+    return rowDiff(refLst, tstLst, keyLst, columns, ignore)
 
 #------------------------------------------------------------------------------
 def dicDiffer(ref, tst):
-    "Returns differences between two simple Dictionaries"
-
-    toRet = {}
-
-    #--------------------------------------------------------------------------
-    # Prejdem vsetky polozky v Ref
-    #--------------------------------------------------------------------------
-    for refKey in ref.keys():
-
-        # Skontrolujem, ci sa nachadza aj v tst
-        if refKey in tst.keys():
+    "Returns differences between two simple Dictionaries. See rowdiff.dicDiffer"
 
-            # Skontrolujem, ci su rovnake hodnoty
-            if ref[refKey] != tst[refKey]: toRet[refKey] = {'key':refKey, 'ref':ref[refKey], 'tst':tst[refKey]}
+    from rowdiff import dicDiffer
 
-        else: toRet[refKey] = {'key':refKey, 'ref':ref[refKey], 'tst':None}
-
-    #--------------------------------------------------------------------------
-    # Prejdem vsetky polozky v Tst
-    #--------------------------------------------------------------------------
-    for tstKey in tst.keys():
-
-        # Skontrolujem, ci sa nachadza aj v ref
-        if tstKey not in ref.keys(): toRet[tstKey] = {'key':refKey, 'ref':None, 'tst':tst[tstKey]}
-
-    #--------------------------------------------------------------------------
-    return toRet
+    return dicDiffer(ref, tst)
 
 #==============================================================================
 # Base64 Tools
@@ -976,6 +1027,9 @@ if __name__ == '__main__':
         print('tifToDate(19500.55)            = ', tifToDate(19500.55)            )
         print('tifToChar(19500.55)            = ', tifToChar(19500.55)            )
         print('tifToChar(19500.55, dec=False) = ', tifToChar(19500.55, dec=False) )
+        print('datesToTif([date.today()])     = ', datesToTif([date.today()])     )
+        print('tifsToDate([19500, 19501])     = ', tifsToDate([19500, 19501])     )
+        print('tifsToDate([19500.55])         = ', tifsToDate([19500.55])         )
         print()
 
 #==============================================================================
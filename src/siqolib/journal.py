@@ -1,11 +1,10 @@
 #==============================================================================
 # Siqo common library
 #------------------------------------------------------------------------------
-from   datetime import date, datetime
 import pytz
 import os
-from   datetime         import date, datetime
-from   general          import _TIME_ZONE
+from   datetime         import date
+from   timestamp        import getTimestamp
 
 #==============================================================================
 # package's constants
@@ -29,6 +28,7 @@ _TIME_WARNING = 6
 #==============================================================================
 # package's variables
 #------------------------------------------------------------------------------
+_timestamp    = getTimestamp(_TIME_ZONE)    # Shared cached clock for journal lines
 
 #==============================================================================
 # Journal
@@ -86,7 +86,7 @@ class SiqoJournal:
         if self.verbose: ids = f'<{id(self)}>'
         else           : ids = ''
 
-        head = '{}{} {}>'.format( ids, datetime.now(_TIME_ZONE).strftime('%Y-%m-%d %H:%M:%S'), self.user )
+        head = '{}{} {}>'.format( ids, _timestamp.stamp('%Y-%m-%d %H:%M:%S'), self.user )
 
         #----------------------------------------------------------------------
         # Priprava vystupu - line
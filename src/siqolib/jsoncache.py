@@ -0,0 +1,174 @@
+#==============================================================================
+# Siqo JSON file cache library
+#------------------------------------------------------------------------------
+import os
+import time
+import threading
+from   types              import MappingProxyType
+from   collections        import OrderedDict
+
+from   singleton          import SingletonMeta
+from   jsoncodec          import SiqoJsonCodec
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_MAX_SIZE   = 64       # Maximalny pocet suborov v cache
+_RECHECK    = 0.0      # Pocet sekund, pocas ktorych sa subor znova nekontroluje
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Utilities
+#------------------------------------------------------------------------------
+def freeze(obj):
+    "Returns read-only deep copy of parsed JSON, dicts as MappingProxyType and lists as tuples"
+
+    if isinstance(obj, dict): return MappingProxyType({key: freeze(val) for key, val in obj.items()})
+    if isinstance(obj, list): return tuple(freeze(val) for val in obj)
+
+    return obj
+
+#------------------------------------------------------------------------------
+def thaw(obj):
+    "Returns mutable deep copy of frozen JSON, MappingProxyType as dicts and tuples as lists"
+
+    if isinstance(obj, (dict, MappingProxyType)): return {key: thaw(val) for key, val in obj.items()}
+    if isinstance(obj, (list, tuple))           : return [thaw(val) for val in obj]
+
+    return obj
+
+#------------------------------------------------------------------------------
+def _signature(st):
+    "Returns (mtime, size, inode) of os.stat result"
+
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+#==============================================================================
+# SiqoJsonCache
+#------------------------------------------------------------------------------
+class SiqoJsonCache(metaclass=SingletonMeta):
+    """
+    Shared cache of parsed JSON files keyed by path. A cached object is
+    returned until the (mtime, size, inode) of the file changes, so only an
+    os.stat touches the file system. With recheck > 0 even the stat is
+    skipped for recheck seconds after the last check. The cache keeps at most
+    maxSize files, the least recently used is dropped. The cached object is
+    shared by all callers; use frozen=True for a read-only view.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, maxSize=_MAX_SIZE, recheck=_RECHECK):
+        "Call constructor of SiqoJsonCache"
+
+        self.maxSize = maxSize              # Maximalny pocet suborov v cache
+        self.recheck = recheck              # Pocet sekund bez kontroly suboru
+        self.items   = OrderedDict()        # {(path, enc): [signature, checked, obj, frozen]}
+        self.lock    = threading.Lock()
+        self.hits    = 0
+        self.misses  = 0
+
+    #--------------------------------------------------------------------------
+    def _load(self, key, fileName, enc):
+        "Loads the file and stores it into cache, returns the item or None on error"
+
+        try:
+            sig = _signature(os.stat(fileName))
+            obj = SiqoJsonCodec().load(fileName, enc)
+
+            # Subor sa mohol zmenit pocas citania, ulozim podpis pred citanim
+            item = [sig, time.monotonic(), obj, None]
+
+        except Exception as err:
+
+            print(f'SIQO.SiqoJsonCache: {fileName} ERROR {str(err)}')
+            with self.lock: self.items.pop(key, None)
+            return None
+
+        print(f'SIQO.SiqoJsonCache: From {fileName} was loaded {len(obj)} entries')
+
+        with self.lock:
+
+            self.items[key] = item
+            self.items.move_to_end(key)
+
+            while len(self.items) > self.maxSize: self.items.popitem(last=False)
+
+        return item
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def get(self, fileName, enc='utf-8', frozen=False):
+        "Returns parsed JSON file from cache, reloads it if the file was changed. Returns None on error"
+
+        key = (os.path.abspath(fileName), enc)
+        now = time.monotonic()
+
+        with self.lock: item = self.items.get(key)
+
+        #----------------------------------------------------------------------
+        # Kontrola zmeny suboru
+        #----------------------------------------------------------------------
+        if item is not None and now - item[1] >= self.recheck:
+
+            try   : sig = _signature(os.stat(fileName))
+            except OSError: sig = None
+
+            if sig == item[0]: item[1] = now
+            else             : item    = None
+
+        #----------------------------------------------------------------------
+        # Hit alebo nacitanie
+        #----------------------------------------------------------------------
+        if item is not None:
+
+            self.hits += 1
+            with self.lock:
+                if key in self.items: self.items.move_to_end(key)
+
+        else:
+
+            self.misses += 1
+            item = self._load(key, fileName, enc)
+            if item is None: return None
+
+        if not frozen: return item[2]
+
+        if item[3] is None: item[3] = freeze(item[2])
+        return item[3]
+
+    #--------------------------------------------------------------------------
+    def invalidate(self, fileName=None, enc=None):
+        "Drops the file (all encodings if enc is None) or the whole cache if fileName is None"
+
+        with self.lock:
+
+            if fileName is None:
+                self.items.clear()
+                return
+
+            path = os.path.abspath(fileName)
+
+            for key in [key for key in self.items if key[0] == path and enc in (None, key[1])]: del self.items[key]
+
+    #--------------------------------------------------------------------------
+    def stats(self):
+        "Returns statistics of the cache"
+
+        with self.lock: return {'size':len(self.items), 'maxSize':self.maxSize, 'hits':self.hits, 'misses':self.misses}
+
+#==============================================================================
+# JSON file cache
+#------------------------------------------------------------------------------
+print(f'SIQO jsoncache library ver {_VER}')
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
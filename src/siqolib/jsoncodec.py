@@ -0,0 +1,340 @@
+#==============================================================================
+# Siqo JSON codec library
+#------------------------------------------------------------------------------
+import re
+import json
+import math
+import time
+import enum
+import uuid
+import importlib
+
+from   singleton          import SingletonMeta
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_BACKENDS   = ('orjson', 'ujson', 'simdjson', 'json')   # Od najrychlejsieho
+_COMPACT    = (',', ':')                                 # Separatory kompaktneho JSON
+
+# Cisla, ktore rychle backendy formatuju inak ako json (1e16 vs 1e+16, 0.00001 vs 1e-05).
+# Vzory zacinaju literalom, aby hladanie bolo rychle, znak pred nimi overim zvlast
+_EXPONENT   = re.compile(rb'e[-+\d]')
+_SMALL      = re.compile(rb'0\.0000')
+_DIGITS     = frozenset(b'0123456789')
+
+# Cele cisla s 20 a viac ciframi a zaporne s 19 ciframi (pod -2**63) nemusia mat v rychlom backende
+# 64 bitov, cifry zamenim za '0' a hladam behy 19 cifier
+_ZEROS_B    = bytes.maketrans(b'123456789', b'000000000')
+_ZEROS_S    = str.maketrans('123456789', '000000000')
+_LONG       = 19 * '0'
+_BEFORE_S   = frozenset('[:,- \t\r\n')
+_BEFORE_B   = frozenset(bytes([c]) for c in b'[:,- \t\r\n')
+
+_CONTAINERS = frozenset((dict, list, tuple))
+_SCALARS    = frozenset((str, int, bool, type(None)))
+
+# Backendy, ktore prilis velke cele cislo potichu nacitaju ako float
+_LOSSY      = ('orjson', 'simdjson')
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Backends
+#------------------------------------------------------------------------------
+def _stdLoads(s):
+
+    return json.loads(s)
+
+#------------------------------------------------------------------------------
+def _stdDumps(obj, default=None):
+
+    return json.dumps(obj, ensure_ascii=False, separators=_COMPACT, default=default or _default).encode('utf-8')
+
+#------------------------------------------------------------------------------
+def _hasExponent(b):
+    "Returns True if JSON bytes b contain a number json writes in a different format"
+
+    # Cislo s exponentom
+    for match in _EXPONENT.finditer(b):
+        if match.start() > 0 and b[match.start() - 1] in _DIGITS: return True
+
+    # Cislo mensie ako 1e-4 bez exponentu
+    for match in _SMALL.finditer(b):
+        if match.start() == 0 or b[match.start() - 1] not in _DIGITS: return True
+
+    return False
+
+#------------------------------------------------------------------------------
+def _hasLong(s):
+    "Returns True if JSON str or bytes s may contain an integer out of 64 bits, digit runs in strings are skipped"
+
+    if isinstance(s, str): (zeros, long, before) = (s.translate(_ZEROS_S), _LONG, _BEFORE_S)
+    else                 : (zeros, long, before) = (bytes(s).translate(_ZEROS_B), _LONG.encode(), _BEFORE_B)
+
+    zero = long[:1]
+    pos  = zeros.find(long)
+
+    while pos >= 0:
+
+        # Zaciatok a koniec behu cifier
+        start = pos
+        while start > 0 and zeros[start - 1:start] == zero: start -= 1
+
+        pos += len(long)
+        while zeros[pos:pos + 1] == zero: pos += 1
+
+        # Cislo (nie string ako "12345...") nasleduje po [ : , - alebo medzere, 19 cifier pretecie iba zaporne
+        prev = zeros[start - 1:start] if start > 0 else None
+
+        if prev is None or prev in before:
+            if pos - start > len(long) or prev in ('-', b'-'): return True
+
+        pos = zeros.find(long, pos)
+
+    return False
+
+#------------------------------------------------------------------------------
+def _hasNonFinite(obj):
+    "Returns True if obj contains NaN or Infinity, which fast backends write as null"
+
+    stack = [obj]
+
+    while stack:
+
+        obj = stack.pop()
+
+        if   isinstance(obj, dict)         : vals = obj.values()
+        elif isinstance(obj, (list, tuple)): vals = obj
+        elif isinstance(obj, float)        : vals = (float(obj),)
+        else                               : continue
+
+        # Presne typy testujem rychlo cez type, podtriedy idu cez zasobnik
+        for val in vals:
+
+            typ = type(val)
+
+            if   typ is float:
+                if val - val != 0.0: return True
+
+            elif typ in _SCALARS                               : continue
+            elif typ in _CONTAINERS                            : stack.append(val)
+            elif isinstance(val, (float, dict, list, tuple))   : stack.append(val)
+
+    return False
+
+#------------------------------------------------------------------------------
+def _default(obj):
+    "Default hook of all backends, UUID and Enum as orjson writes them natively, other types raise TypeError as in json"
+
+    if isinstance(obj, uuid.UUID): return str(obj)
+    if isinstance(obj, enum.Enum): return obj.value
+
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+#------------------------------------------------------------------------------
+def _backend(name):
+    "Returns (loads, dumps) of the backend, dumps(obj, default) returns utf-8 bytes or None for stdlib json"
+
+    mod = importlib.import_module(name)
+
+    # datetime a dataclass orjson nativne zapisuje, json nie, preto idu cez default ako v json
+    if name == 'orjson':
+        opts = mod.OPT_PASSTHROUGH_DATETIME | mod.OPT_PASSTHROUGH_DATACLASS
+        return (mod.loads, lambda obj, default: mod.dumps(obj, default=default, option=opts))
+
+    if name == 'ujson':
+        return (mod.loads, lambda obj, default: mod.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, default=default).encode('utf-8'))
+
+    # simdjson vie iba citat
+    if name == 'simdjson':
+        return (mod.loads, None)
+
+    return (_stdLoads, None)
+
+#==============================================================================
+# SiqoJsonCodec
+#------------------------------------------------------------------------------
+class SiqoJsonCodec(metaclass=SingletonMeta):
+    """
+    Shared JSON codec. At first use picks the fastest installed backend
+    (orjson, ujson, simdjson) and falls back to the stdlib json. Compact
+    output is identical to json.dumps(ensure_ascii=False, separators=(',',':'))
+    for dicts with str keys, lists, tuples, str, int, float, bool and None:
+    when a backend fails or may format a number differently, the value is
+    encoded by json again. Documents with bare 20+ digit numbers are parsed
+    by json again to keep integers out of 64 bits exact. Types json does not
+    know (datetime, dataclass, ...) go to the same default hook in all
+    backends. NaN and Infinity are written as json writes them (NaN,
+    Infinity). Pretty output with indent is always written by json.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, prefer=None):
+        "Call constructor of SiqoJsonCodec, prefer is list of backend names to try"
+
+        self.prefer   = tuple(prefer) if prefer else _BACKENDS   # Poradie skusanych backendov
+        self.name     = None                                     # Meno aktivneho backendu
+        self._loads   = None                                     # Funkcia loads backendu
+        self._dumps   = None                                     # Funkcia dumps backendu alebo None
+
+    #--------------------------------------------------------------------------
+    def _select(self):
+        "Selects the first importable backend"
+
+        for name in self.prefer:
+
+            try   : (self._loads, self._dumps) = _backend(name)
+            except ImportError: continue
+
+            self.name = name
+            return
+
+        (self._loads, self._dumps) = _backend('json')
+        self.name = 'json'
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def backend(self):
+        "Returns name of the active backend"
+
+        if self.name is None: self._select()
+        return self.name
+
+    #--------------------------------------------------------------------------
+    def use(self, name):
+        "Switches the codec to backend name, raises ImportError if it is not installed"
+
+        (self._loads, self._dumps) = _backend(name)
+        self.name = name
+
+    #--------------------------------------------------------------------------
+    def loads(self, s):
+        "Returns object parsed from JSON str or bytes"
+
+        if self.name is None: self._select()
+
+        if self.name == 'json': return json.loads(s)
+
+        try   : toRet = self._loads(s)
+        except (ValueError, TypeError, OverflowError):
+            # O skutocnej chybe aj o preteceni celeho cisla rozhodne json
+            return json.loads(s)
+
+        if self.name in _LOSSY and _hasLong(s): return json.loads(s)
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def dumpb(self, obj, default=None):
+        "Returns compact JSON of obj as utf-8 bytes, default is hook for other types as in json.dumps"
+
+        if self.name is None: self._select()
+
+        if default is None: default = _default
+
+        if self._dumps is not None:
+
+            try   : toRet = self._dumps(obj, default)
+            except (TypeError, ValueError, OverflowError): toRet = None
+
+            # NaN a Infinity zapise rychly backend ako null, json ako NaN a Infinity
+            if toRet is not None and not _hasExponent(toRet):
+                if b'null' not in toRet or not _hasNonFinite(obj): return toRet
+
+        return _stdDumps(obj, default)
+
+    #--------------------------------------------------------------------------
+    def dumps(self, obj, indent=None, default=None):
+        "Returns JSON string of obj, compact if indent is None"
+
+        if indent is not None: return json.dumps(obj, indent=indent, default=default or _default)
+
+        return self.dumpb(obj, default).decode('utf-8')
+
+    #--------------------------------------------------------------------------
+    def load(self, fileName, enc='utf-8'):
+        "Returns object parsed from JSON file"
+
+        if enc.replace('-', '').lower() == 'utf8':
+            with open(fileName, 'rb') as file: return self.loads(file.read())
+
+        with open(fileName, encoding=enc) as file: return self.loads(file.read())
+
+#==============================================================================
+# Benchmark
+#------------------------------------------------------------------------------
+def payloads(rows=20000):
+    "Returns {name: payload} with typical shapes of SIQO data"
+
+    toRet = {}
+
+    toRet['rows'  ] = [{'id':i, 'rc':f'{7801230008 + 11*i}', 'name':f'Meno Priezvisko {i}', 'amount':i * 1.25,
+                        'date':'2024.03.01', 'active':i % 2 == 0, 'note':None} for i in range(rows)]
+
+    toRet['config'] = {f'con{i}': {'type':'oracle', 'func':'Y', 'user':f'user{i}', 'host':f'host{i}.siqo.sk',
+                                   'port':1521, 'opts':{'timeout':30, 'retry':[1, 2, 5]}} for i in range(rows // 100)}
+
+    toRet['text'  ] = [f'Žltý kôň úpel ďábelské ódy {i} / "quoted" \\ line' for i in range(rows)]
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def benchmark(data=None, repeat=3):
+    "Returns {payload: {backend: {'loads', 'dumps', 'same'}}} timings in seconds of installed backends"
+
+    if data is None: data = payloads()
+
+    codec = SiqoJsonCodec()
+    keep  = codec.backend()
+    toRet = {}
+
+    for payName, payload in data.items():
+
+        ref = _stdDumps(payload)
+        toRet[payName] = {}
+
+        for name in _BACKENDS:
+
+            try   : codec.use(name)
+            except ImportError: continue
+
+            start = time.perf_counter()
+            for _ in range(repeat): enc = codec.dumpb(payload)
+            dumpT = (time.perf_counter() - start) / repeat
+
+            start = time.perf_counter()
+            for _ in range(repeat): dec = codec.loads(ref)
+            loadT = (time.perf_counter() - start) / repeat
+
+            toRet[payName][name] = {'loads':loadT, 'dumps':dumpT, 'same':enc == ref and dec == payload}
+
+    codec.use(keep)
+    return toRet
+
+#==============================================================================
+# JSON codec
+#------------------------------------------------------------------------------
+print(f'SIQO jsoncodec library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    print('Active backend:', SiqoJsonCodec().backend())
+
+    for payName, res in benchmark().items():
+        for name, tim in res.items():
+            print(f"{payName:8} {name:10} loads {tim['loads']:.4f}s dumps {tim['dumps']:.4f}s same={tim['same']}")
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
@@ -0,0 +1,232 @@
+#==============================================================================
+# Siqo streaming JSON library
+#------------------------------------------------------------------------------
+import io
+import re
+import json
+import codecs
+
+try   : import ijson
+except ImportError: ijson = None
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_BUF_SIZE   = 1 << 20                  # Pocet znakov citanych naraz
+_WS         = re.compile(r'[ \t\n\r]*')
+_NUM_CHARS  = frozenset('0123456789.eE+-')   # Znaky, ktorymi moze cislo pokracovat
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Pure python reader
+#------------------------------------------------------------------------------
+class _ArrayReader:
+    """
+    Incremental reader of one JSON array from a text stream. Elements are
+    decoded one by one by json.JSONDecoder.raw_decode from a buffer refilled
+    in chunks, so the memory holds only the current element and one chunk.
+    """
+
+    #--------------------------------------------------------------------------
+    def __init__(self, stream, bufSize):
+
+        self.stream  = stream                  # Textovy stream
+        self.bufSize = bufSize                 # Pocet znakov citanych naraz
+        self.buf     = ''                      # Nacitane, este nespracovane znaky
+        self.pos     = 0                       # Pozicia v buf
+        self.eof     = False                   # Stream je docitany
+        self.decoder = json.JSONDecoder()
+
+    #--------------------------------------------------------------------------
+    def _fill(self, size):
+        "Appends next size characters to the buffer, drops processed ones"
+
+        chunk = self.stream.read(size)
+
+        if not chunk: self.eof = True
+        else:
+            self.buf = self.buf[self.pos:] + chunk
+            self.pos = 0
+
+    #--------------------------------------------------------------------------
+    def _char(self):
+        "Skips white space and returns the next character or '' at the end"
+
+        while True:
+
+            self.pos = _WS.match(self.buf, self.pos).end()
+
+            if self.pos < len(self.buf): return self.buf[self.pos]
+            if self.eof                : return ''
+
+            self._fill(self.bufSize)
+
+    #--------------------------------------------------------------------------
+    def _expect(self, chars):
+        "Consumes and returns the next character, raises ValueError if it is not in chars"
+
+        toRet = self._char()
+
+        if toRet == '' or toRet not in chars:
+            raise ValueError(f"SIQO.jsonstream: Expected '{chars}' but found '{toRet}'")
+
+        self.pos += 1
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def _value(self):
+        "Decodes and returns the next JSON value, reads more if the value is not complete"
+
+        self._char()
+        size = self.bufSize
+
+        while True:
+
+            try   : (toRet, end) = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof: raise
+                end = None
+
+            # Cislo na konci buffera moze pokracovat v dalsom chunku
+            if end is not None and (self.eof or (end < len(self.buf) and self.buf[end] not in _NUM_CHARS)):
+                self.pos = end
+                return toRet
+
+            # Velke hodnoty citam so zdvojnasobenim, aby opakovane dekodovanie nebolo kvadraticke
+            self._fill(size)
+            size *= 2
+
+    #--------------------------------------------------------------------------
+    def _descend(self, path):
+        "Moves the reader to the value at path"
+
+        for step in path:
+
+            #------------------------------------------------------------------
+            # Index v poli
+            #------------------------------------------------------------------
+            if isinstance(step, int):
+
+                self._expect('[')
+
+                for _ in range(step):
+                    self._value()
+                    self._expect(',')
+
+                continue
+
+            #------------------------------------------------------------------
+            # Kluc v objekte, hodnoty ostatnych klucov preskocim
+            #------------------------------------------------------------------
+            self._expect('{')
+
+            while True:
+
+                if self._char() == '}': raise KeyError(f'SIQO.jsonstream: Key {step} not found')
+
+                key = self._value()
+                self._expect(':')
+
+                if key == step: break
+
+                self._value()
+                if self._expect(',}') == '}': raise KeyError(f'SIQO.jsonstream: Key {step} not found')
+
+    #--------------------------------------------------------------------------
+    def items(self, path):
+        "Yields elements of the array at path"
+
+        self._descend(path)
+        self._expect('[')
+
+        if self._char() == ']': return
+
+        while True:
+
+            yield self._value()
+
+            if self._expect(',]') == ']': return
+
+#==============================================================================
+# API for users
+#------------------------------------------------------------------------------
+def iterArray(src, path=(), enc='utf-8', bufSize=_BUF_SIZE, useIjson=True):
+    "Yields elements of JSON array at path (keys and indices) in file name or stream one by one"
+
+    prefix = _ijsonPrefix(path, useIjson)
+
+    #--------------------------------------------------------------------------
+    # Subor otvorim a zavriem po docitani
+    #--------------------------------------------------------------------------
+    if isinstance(src, str):
+
+        # Pre ijson binarne, subor v inom kodovani ako utf-8 sa nizsie dekoduje ako text
+        if prefix is not None: file = open(src, 'rb')
+        else                 : file = open(src, encoding=enc)
+
+        with file: yield from iterArray(file, path, enc, bufSize, useIjson)
+        return
+
+    #--------------------------------------------------------------------------
+    # ijson s C backendom pre binarny stream, ak cesta obsahuje iba kluce
+    #--------------------------------------------------------------------------
+    binary = isinstance(src.read(0), bytes)
+
+    if prefix is not None and binary and _utf8Stream(src, enc):
+        yield from ijson.items(src, prefix, use_float=True, buf_size=bufSize)
+        return
+
+    #--------------------------------------------------------------------------
+    # Cisty python nad textovym streamom
+    #--------------------------------------------------------------------------
+    if binary: src = io.TextIOWrapper(src, encoding=enc)
+
+    yield from _ArrayReader(src, bufSize).items(tuple(path))
+
+#------------------------------------------------------------------------------
+def _ijsonPrefix(path, useIjson):
+    "Returns ijson prefix for path or None if ijson can not be used"
+
+    if not useIjson or ijson is None: return None
+
+    for step in path:
+        if not isinstance(step, str) or '.' in step: return None
+
+    return '.'.join(tuple(path) + ('item',))
+
+#------------------------------------------------------------------------------
+def _utf8Stream(src, enc):
+    "Returns True if binary stream src in encoding enc can be given to ijson, which reads only utf-8. Skips utf-8 BOM"
+
+    enc = enc.replace('-', '').replace('_', '').lower()
+
+    if enc == 'utf8'                          : return True
+    if enc != 'utf8sig' or not src.seekable() : return False
+
+    # BOM preskocim, bez neho sa vratim na zaciatok
+    pos = src.tell()
+    if src.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8: src.seek(pos)
+
+    return True
+
+#==============================================================================
+# Streaming JSON
+#------------------------------------------------------------------------------
+print(f'SIQO jsonstream library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    print(list(iterArray(io.StringIO('[1, {"a": [2, 3]}, "x", null]'))))
+    print(list(iterArray(io.StringIO('{"meta": {"n": 2}, "data": {"rows": [{"id": 1}, {"id": 2}]}}'), ['data', 'rows'])))
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
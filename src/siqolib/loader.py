@@ -0,0 +1,131 @@
+#==============================================================================
+# Siqo parallel file loader library
+#------------------------------------------------------------------------------
+import time
+from   concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+from   jsoncodec          import SiqoJsonCodec
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_WORKERS    = 8        # Pocet vlakien pre citanie suborov
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Workers
+#------------------------------------------------------------------------------
+def _kind(path):
+    "Returns 'json' for *.json files, otherwise 'text'"
+
+    return 'json' if path.lower().endswith('.json') else 'text'
+
+#------------------------------------------------------------------------------
+def _parseJson(data):
+    "Returns (object, seconds) parsed from JSON bytes. Module level function, so it can run in a process pool"
+
+    start = time.perf_counter()
+    toRet = SiqoJsonCodec().loads(data)
+
+    return (toRet, time.perf_counter() - start)
+
+#------------------------------------------------------------------------------
+def _readFile(path, kind, enc, parse):
+    "Returns {res, dat, msg, time} for one file, JSON is returned as bytes if not parse"
+
+    start = time.perf_counter()
+
+    try:
+        #----------------------------------------------------------------------
+        # JSON subor
+        #----------------------------------------------------------------------
+        if kind == 'json':
+
+            if parse: dat = SiqoJsonCodec().load(path, enc)
+            else:
+                with open(path, 'rb') as file: dat = file.read()
+
+                # Parser pracuje s utf-8, ine kodovanie prevediem uz tu
+                if enc.replace('-', '').lower() != 'utf8': dat = dat.decode(enc).encode('utf-8')
+
+        #----------------------------------------------------------------------
+        # Textovy subor ako zoznam riadkov rovnako ako general.loadFile
+        #----------------------------------------------------------------------
+        else:
+            with open(path, encoding=enc) as file: dat = [line.replace('\n', '') for line in file]
+
+        return {'res':'OK', 'dat':dat, 'msg':'', 'time':time.perf_counter() - start}
+
+    except Exception as err:
+        return {'res':'ER', 'dat':None, 'msg':str(err), 'time':time.perf_counter() - start}
+
+#==============================================================================
+# API for users
+#------------------------------------------------------------------------------
+def loadFiles(paths, enc='utf-8', workers=_WORKERS, processes=None):
+    "Loads files concurrently on threads, returns {path: {res, dat, msg, time}} with errors collected, not printed"
+
+    #--------------------------------------------------------------------------
+    # Paths je zoznam (*.json ako JSON, ostatne ako zoznam riadkov) alebo {path: 'json'|'text'}
+    #--------------------------------------------------------------------------
+    if isinstance(paths, dict): kinds = dict(paths)
+    else                      : kinds = {path: _kind(path) for path in paths}
+
+    procs = processes is not None and processes > 1
+    toRet = {}
+
+    #--------------------------------------------------------------------------
+    # Citanie na vlaknach, JSON bud hned parsujem alebo poslem do procesov
+    #--------------------------------------------------------------------------
+    with ThreadPoolExecutor(max_workers=workers) as threads:
+
+        futures = {threads.submit(_readFile, path, kind, enc, not procs): path for path, kind in kinds.items()}
+
+        if not procs:
+            for future in as_completed(futures): toRet[futures[future]] = future.result()
+
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+
+                parsing = {}
+
+                for future in as_completed(futures):
+
+                    path = futures[future]
+                    item = future.result()
+                    toRet[path] = item
+
+                    if item['res'] == 'OK' and kinds[path] == 'json': parsing[pool.submit(_parseJson, item['dat'])] = path
+
+                #--------------------------------------------------------------
+                # Vysledky parsovania, cas je citanie plus parsovanie
+                #--------------------------------------------------------------
+                for future in as_completed(parsing):
+
+                    item = toRet[parsing[future]]
+
+                    try:
+                        (item['dat'], dur) = future.result()
+                        item['time'] += dur
+
+                    except Exception as err:
+                        item.update({'res':'ER', 'dat':None, 'msg':str(err)})
+
+    #--------------------------------------------------------------------------
+    # Vysledok v poradi vstupu
+    #--------------------------------------------------------------------------
+    return {path: toRet[path] for path in kinds}
+
+#==============================================================================
+# Parallel file loader
+#------------------------------------------------------------------------------
+print(f'SIQO loader library ver {_VER}')
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
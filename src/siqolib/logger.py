@@ -4,10 +4,10 @@
 import functools
 import logging
 import inspect
-from   datetime               import datetime
+import time
 
 from  singleton          import SingletonMeta
-from  general            import TIME_ZONE
+from  timestamp          import getTimestamp
 
 #==============================================================================
 # package's constants
@@ -36,7 +36,9 @@ _TIME_WARNING            = 20
 #==============================================================================
 # package's variables
 #------------------------------------------------------------------------------
-_timeStats = {}   # Dict to store time duration for functions {functon_name: [start_time, duration]}
+_timeStats = {}                 # Dict to store time duration for functions {functon_name: [start_time, duration]}
+_timestamp = getTimestamp()     # Shared cached CET clock for stopwatch
+_localtime = getTimestamp(None) # Shared cached local time clock for log records as logging.Formatter
 
 #----------------------------------------------------------------------
 # Add AUDTIT level to the logging module
@@ -78,7 +80,8 @@ def stopWatch(function):
         #----------------------------------------------------------------------
         # Before decorated function
         #----------------------------------------------------------------------
-        start = datetime.now(TIME_ZONE)
+        start = _timestamp.now()
+        tick  = time.perf_counter()
 
         #----------------------------------------------------------------------
         # Actual call function
@@ -88,18 +91,17 @@ def stopWatch(function):
         #----------------------------------------------------------------------
         # After decorated function
         #----------------------------------------------------------------------
-        stop = datetime.now(TIME_ZONE)
-        dur  = stop - start
+        dur = time.perf_counter() - tick
 
         #----------------------------------------------------------------------
         # Store time duration for the function
         #----------------------------------------------------------------------
         if function.__name__ not in _timeStats: _timeStats[function.__name__] = []
-        _timeStats[function.__name__].append([start, dur.total_seconds()])
+        _timeStats[function.__name__].append([start, dur])
 
-        if dur.total_seconds() > _TIME_WARNING:
+        if dur > _TIME_WARNING:
             logger = SiqoLogger()
-            logger.warning(f"{function.__name__}() took {dur.seconds} seconds to complete TIME WARNING")
+            logger.warning(f"{function.__name__}() took {int(dur)} seconds to complete TIME WARNING")
 
         #----------------------------------------------------------------------
         return resp
@@ -122,7 +124,8 @@ def asyncStopWatch(function):
         #----------------------------------------------------------------------
         # Before decorated function
         #----------------------------------------------------------------------
-        start = datetime.now(TIME_ZONE)
+        start = _timestamp.now()
+        tick  = time.perf_counter()
 
         #----------------------------------------------------------------------
         # Actual call function
@@ -132,18 +135,17 @@ def asyncStopWatch(function):
         #----------------------------------------------------------------------
         # After decorated function
         #----------------------------------------------------------------------
-        stop = datetime.now(TIME_ZONE)
-        dur  = stop - start
+        dur = time.perf_counter() - tick
 
         #----------------------------------------------------------------------
         # Store time duration for the function
         #----------------------------------------------------------------------
         if function.__name__ not in _timeStats: _timeStats[function.__name__] = []
-        _timeStats[function.__name__].append([start, dur.total_seconds()])
+        _timeStats[function.__name__].append([start, dur])
 
-        if dur.total_seconds() > _TIME_WARNING:
+        if dur > _TIME_WARNING:
             logger = SiqoLogger()
-            logger.warning(f"{function.__name__}() took {dur.seconds} seconds to complete TIME WARNING")
+            logger.warning(f"{function.__name__}() took {int(dur)} seconds to complete TIME WARNING")
 
         #----------------------------------------------------------------------
         return resp
@@ -165,6 +167,12 @@ class SiqoFormatter(logging.Formatter):
             record.levelname = record.levelname[:1]  # Truncate levelname to 1 character
         return super().format(record)
 
+    def formatTime(self, record, datefmt=None):
+        "Uses shared cached local time timestamp instead of time.localtime/strftime per record"
+
+        if datefmt: return _localtime.stamp(datefmt, record.created)
+        else      : return self.default_msec_format % (_localtime.stamp(self.default_time_format, record.created), record.msecs)
+
 #------------------------------------------------------------------------------
 class SiqoLogger(metaclass=SingletonMeta):
     "Siqo Logger class"
@@ -0,0 +1,138 @@
+#==============================================================================
+# Siqo mask compiler library
+#------------------------------------------------------------------------------
+import re
+import sys
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER      = '1.00'
+
+# Pomenovane triedy znakov, rovnake ako v general.getMask
+_CLASSES  = {'upper': 'ABCDEFGHIJKLMNOPQRSTUVWXYZĽĹŠČŤŽÝÁÍÉÚŇ',
+             'lower': 'abcdefghijklmnopqrstuvwxyzľĺščťžýáäíéúňô',
+             'punct': '`~#$%^&\\\'"/?§;:',
+             'digit': None,    # Vsetky unicode cislice ako regex \d, doplni sa pri prvom pouziti
+             'space': None}    # Vsetky unicode medzery ako regex \s, doplni sa pri prvom pouziti
+
+# Definicia masky general.getMask
+_GET_MASK = (('C', 'upper'), ('c', 'lower'), ('N', 'digit'), (' ', 'space'), ('^', 'punct'))
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+_compiled = {}    # Cache skompilovanych masiek {(classes, collapse): SiqoMask}
+
+#==============================================================================
+# Character classes
+#------------------------------------------------------------------------------
+def _classChars(definition):
+    "Returns string of characters for named class or custom set of characters"
+
+    if definition not in _CLASSES: return definition
+
+    #--------------------------------------------------------------------------
+    # Unicode triedy vypocitam raz pre cely proces
+    #--------------------------------------------------------------------------
+    if _CLASSES[definition] is None:
+
+        if definition == 'digit': test = str.isdecimal
+        else                    : test = str.isspace
+
+        _CLASSES[definition] = ''.join(chr(i) for i in range(sys.maxunicode + 1) if test(chr(i)))
+
+    return _CLASSES[definition]
+
+#==============================================================================
+# SiqoMask
+#------------------------------------------------------------------------------
+class SiqoMask:
+    """
+    Compiled value mask. Character classes are given as ((target, definition), ...)
+    where definition is a named class ('upper', 'lower', 'digit', 'space',
+    'punct') or a string of custom characters. All classes are merged into one
+    str.translate table, so a value is masked in one C-level pass. If a
+    character is in more classes, the first class wins. Runs of the target
+    characters listed in collapse are shrunk to one character.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, classes=_GET_MASK, collapse=''):
+        "Call constructor of SiqoMask and compile the translate table"
+
+        self.classes  = tuple(classes)    # Definicia tried znakov
+        self.collapse = collapse          # Cielove znaky, ktorych behy sa zluckuju
+        self.table    = {}                # Translate tabulka {ord(char): target}
+
+        for target, definition in reversed(self.classes):
+            for char in _classChars(definition): self.table[ord(char)] = target
+
+        if collapse: self.runs = re.compile('([' + re.escape(collapse) + '])\\1+')
+        else       : self.runs = None
+
+    #--------------------------------------------------------------------------
+    def __call__(self, s):
+
+        return self.mask(s)
+
+    #--------------------------------------------------------------------------
+    def __reduce__(self):
+        "Pickles only the definition, so the mask can be sent to a process pool cheaply"
+
+        return (getMasker, (self.classes, self.collapse))
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def mask(self, s):
+        "Returns mask of the string s"
+
+        toRet = s.translate(self.table)
+
+        if self.runs is not None: toRet = self.runs.sub(r'\1', toRet)
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def maskCol(self, values):
+        "Returns list of masks for iterable of strings"
+
+        table = self.table
+
+        if self.runs is None: return [s.translate(table) for s in values]
+
+        sub = self.runs.sub
+        return [sub(r'\1', s.translate(table)) for s in values]
+
+#------------------------------------------------------------------------------
+def getMasker(classes=_GET_MASK, collapse=''):
+    "Returns cached SiqoMask for the definition"
+
+    key   = (tuple(tuple(cls) for cls in classes), collapse)
+    toRet = _compiled.get(key)
+
+    if toRet is None:
+        toRet = SiqoMask(key[0], collapse)
+        _compiled[key] = toRet
+
+    return toRet
+
+#==============================================================================
+# Mask compiler
+#------------------------------------------------------------------------------
+print(f'SIQO mask library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    print(getMasker().mask('Žltý kôň 12/3'))
+    print(getMasker(collapse='cN').mask('Žltý kôň 12/3'))
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
@@ -0,0 +1,211 @@
+#==============================================================================
+# Siqo bytes obfuscation library
+#------------------------------------------------------------------------------
+from   itertools          import accumulate
+
+try   : import numpy as np
+except ImportError: np = None
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_CHUNK_SIZE = 1 << 20   # Pocet bajtov citanych zo suboru naraz
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Utilities
+#------------------------------------------------------------------------------
+def _bytes(data):
+    "Returns data as bytes, strings are encoded in utf-8"
+
+    if isinstance(data, str): return data.encode('utf-8')
+    return bytes(data)
+
+#------------------------------------------------------------------------------
+def _keyStream(key, pos, length):
+    "Returns bytes of the key cycled from position pos with given length"
+
+    lenKey = len(key)
+    pos    = pos % lenKey
+
+    return (key[pos:] + key * (length // lenKey + 1))[:length]
+
+#==============================================================================
+# Bytes counterparts of general.strXor, strSalted and strWatermark
+#------------------------------------------------------------------------------
+def bytesXor(data, key, pos=0):
+    "Returns data XOR-ed with the cycled key starting at key position pos"
+
+    data = _bytes(data)
+    key  = _bytes(key)
+
+    if not data or not key: return data
+
+    stream = _keyStream(key, pos, len(data))
+
+    #--------------------------------------------------------------------------
+    # Numpy XOR po bajtoch, inak XOR dvoch velkych cisel
+    #--------------------------------------------------------------------------
+    if np is not None:
+        return (np.frombuffer(data, np.uint8) ^ np.frombuffer(stream, np.uint8)).tobytes()
+
+    toRet = int.from_bytes(data, 'big') ^ int.from_bytes(stream, 'big')
+    return toRet.to_bytes(len(data), 'big')
+
+#------------------------------------------------------------------------------
+def bytesSalted(data, state=None):
+    "Returns bytes of data ordered by Fibonacci-like modulo sequence as general.strSalted"
+
+    data = _bytes(data)
+    lenD = len(data)
+
+    if lenD == 0: return data
+
+    # Kontrolny sucet ako general.strChsum
+    if state is None: state = sum(data) % lenD
+
+    #--------------------------------------------------------------------------
+    # Poradie je kumulativny sucet modulo dlzka ako general.strFibbMod
+    #--------------------------------------------------------------------------
+    if np is not None:
+        arr   = np.frombuffer(data, np.uint8)
+        order = (np.cumsum(arr, dtype=np.int64) + state) % lenD
+        return arr[order].tobytes()
+
+    order = accumulate(data, lambda acc, b: (acc + b) % lenD, initial=state)
+    next(order)
+
+    return bytes(map(data.__getitem__, order))
+
+#------------------------------------------------------------------------------
+def bytesWatermark(data, mark, pos=0):
+    "Returns data with bytes of mark placed as general.strWatermark, mark position starts at pos"
+
+    data = _bytes(data)
+    mark = _bytes(mark)
+
+    if not data or not mark: return data
+
+    lenM = len(mark)
+
+    #--------------------------------------------------------------------------
+    # Numpy
+    #--------------------------------------------------------------------------
+    if np is not None:
+
+        arr  = np.frombuffer(data, np.uint8)
+        idx  = (np.arange(len(arr), dtype=np.int64) + pos) % lenM
+        subs = np.frombuffer(mark, np.uint8)[idx]
+
+        return np.where(3 * (arr % (idx + 1)) > lenM, subs, arr).astype(np.uint8).tobytes()
+
+    #--------------------------------------------------------------------------
+    # Cisty python
+    #--------------------------------------------------------------------------
+    stream = _keyStream(mark, pos, len(data))
+    idxs   = [(pos + i) % lenM for i in range(len(data))]
+
+    return bytes([m if 3 * (b % (p + 1)) > lenM else b for b, m, p in zip(data, stream, idxs)])
+
+#==============================================================================
+# Streaming API
+#------------------------------------------------------------------------------
+def xorIter(chunks, key):
+    "Yields XOR-ed chunks, key position continues across chunks"
+
+    key = _bytes(key)
+    pos = 0
+
+    for chunk in chunks:
+
+        yield bytesXor(chunk, key, pos)
+        pos = (pos + len(chunk)) % len(key)
+
+#------------------------------------------------------------------------------
+def watermarkIter(chunks, mark):
+    "Yields watermarked chunks, mark position continues across chunks"
+
+    mark = _bytes(mark)
+    pos  = 0
+
+    for chunk in chunks:
+
+        yield bytesWatermark(chunk, mark, pos)
+        pos = (pos + len(chunk)) % len(mark)
+
+#------------------------------------------------------------------------------
+def saltedIter(chunks, state=None):
+    "Yields salted chunks, every chunk is salted as a separate block"
+
+    for chunk in chunks: yield bytesSalted(chunk, state)
+
+#------------------------------------------------------------------------------
+def readChunks(src, chunkSize=_CHUNK_SIZE):
+    "Yields chunks of bytes from file name or binary stream"
+
+    if isinstance(src, str):
+        with open(src, 'rb') as file: yield from readChunks(file, chunkSize)
+        return
+
+    while True:
+
+        chunk = src.read(chunkSize)
+        if not chunk: return
+
+        yield chunk
+
+#------------------------------------------------------------------------------
+def _writeChunks(dst, chunks):
+    "Writes chunks to file name or binary stream and returns number of bytes written"
+
+    if isinstance(dst, str):
+        with open(dst, 'wb') as file: return _writeChunks(file, chunks)
+
+    toRet = 0
+
+    for chunk in chunks:
+        dst.write(chunk)
+        toRet += len(chunk)
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def xorFile(src, dst, key, chunkSize=_CHUNK_SIZE):
+    "XOR-es src file or stream into dst in chunks with constant memory, returns number of bytes"
+
+    return _writeChunks(dst, xorIter(readChunks(src, chunkSize), key))
+
+#------------------------------------------------------------------------------
+def watermarkFile(src, dst, mark, chunkSize=_CHUNK_SIZE):
+    "Watermarks src file or stream into dst in chunks with constant memory, returns number of bytes"
+
+    return _writeChunks(dst, watermarkIter(readChunks(src, chunkSize), mark))
+
+#------------------------------------------------------------------------------
+def saltedFile(src, dst, state=None, chunkSize=_CHUNK_SIZE):
+    "Salts src file or stream into dst in blocks of chunkSize, returns number of bytes"
+
+    return _writeChunks(dst, saltedIter(readChunks(src, chunkSize), state))
+
+#==============================================================================
+# Bytes obfuscation
+#------------------------------------------------------------------------------
+print(f'SIQO obfuscate library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    print(bytesXor(bytesXor('Hello world', 'key'), 'key'))
+    print(bytesSalted('Hello world'))
+    print(bytesWatermark('Hello world', 'SIQO'))
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
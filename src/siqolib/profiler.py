@@ -0,0 +1,199 @@
+#==============================================================================
+# Siqo column profiler library
+#------------------------------------------------------------------------------
+from   itertools          import islice
+from   concurrent.futures import ProcessPoolExecutor
+
+from   column             import isNumberCol, isDateCol
+from   mask               import getMasker
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_CHUNK_SIZE = 10000    # Pocet hodnot v jednom chunku
+_TOP_K      = 20       # Pocet najcastejsich masiek vo vysledku
+_EXAMPLES   = 3        # Pocet prikladov hodnot pre kazdu masku
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Chunk statistics
+#------------------------------------------------------------------------------
+def profileChunk(values, examples=_EXAMPLES, masker=None):
+    "Returns partial statistics for list of values. Module level function, so it can run in a process pool"
+
+    if masker is None: masker = getMasker()
+
+    toRet = {'count':len(values), 'nulls':0, 'empty':0, 'minLen':None, 'maxLen':None, 'sumLen':0,
+             'numbers':0, 'dates':0, 'masks':{}}
+
+    #--------------------------------------------------------------------------
+    # Null hodnoty vynecham, ostatne prevediem na string
+    #--------------------------------------------------------------------------
+    strs = [val if isinstance(val, str) else str(val) for val in values if val is not None]
+    toRet['nulls'] = len(values) - len(strs)
+
+    if not strs: return toRet
+
+    #--------------------------------------------------------------------------
+    # Dlzky a validatory
+    #--------------------------------------------------------------------------
+    lens = [len(s) for s in strs]
+
+    toRet['empty'  ] = lens.count(0)
+    toRet['minLen' ] = min(lens)
+    toRet['maxLen' ] = max(lens)
+    toRet['sumLen' ] = sum(lens)
+    toRet['numbers'] = int(sum(isNumberCol(strs)))
+    toRet['dates'  ] = int(sum(isDateCol  (strs)))
+
+    #--------------------------------------------------------------------------
+    # Histogram masiek {mask: [count, [examples]]}
+    #--------------------------------------------------------------------------
+    masks = toRet['masks']
+
+    for s, mask in zip(strs, masker.maskCol(strs)):
+
+        item = masks.get(mask)
+
+        if item is None: masks[mask] = [1, [s]]
+        else:
+            item[0] += 1
+            if len(item[1]) < examples and s not in item[1]: item[1].append(s)
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def mergeStats(acc, part, examples=_EXAMPLES):
+    "Merges partial statistics part into acc and returns acc"
+
+    for key in ('count', 'nulls', 'empty', 'sumLen', 'numbers', 'dates'): acc[key] += part[key]
+
+    if part['minLen'] is not None:
+        acc['minLen'] = part['minLen'] if acc['minLen'] is None else min(acc['minLen'], part['minLen'])
+        acc['maxLen'] = part['maxLen'] if acc['maxLen'] is None else max(acc['maxLen'], part['maxLen'])
+
+    for mask, (cnt, exs) in part['masks'].items():
+
+        item = acc['masks'].get(mask)
+
+        if item is None: acc['masks'][mask] = [cnt, list(exs)]
+        else:
+            item[0] += cnt
+            for s in exs:
+                if len(item[1]) < examples and s not in item[1]: item[1].append(s)
+
+    return acc
+
+#==============================================================================
+# SiqoProfiler
+#------------------------------------------------------------------------------
+class SiqoProfiler:
+    """
+    Streaming column profiler. Values are read in chunks, every chunk is
+    profiled by profileChunk (optionally in a process pool) and merged into
+    running statistics, so a column is profiled in a single pass.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, chunkSize=_CHUNK_SIZE, topK=_TOP_K, examples=_EXAMPLES, workers=None, masker=None):
+        "Call constructor of SiqoProfiler. If workers > 1, chunks are profiled in a process pool"
+
+        self.chunkSize = chunkSize     # Pocet hodnot v jednom chunku
+        self.topK      = topK          # Pocet najcastejsich masiek vo vysledku
+        self.examples  = examples      # Pocet prikladov hodnot pre kazdu masku
+        self.workers   = workers       # Pocet procesov, None alebo 1 znamena bez poolu
+        self.masker    = masker        # SiqoMask pre histogram, None znamena masku general.getMask
+
+    #--------------------------------------------------------------------------
+    def _chunks(self, values):
+        "Yields lists of chunkSize values from iterable"
+
+        it = iter(values)
+
+        while True:
+            chunk = list(islice(it, self.chunkSize))
+            if not chunk: return
+            yield chunk
+
+    #--------------------------------------------------------------------------
+    def _parts(self, values):
+        "Yields partial statistics of chunks, in a process pool with bounded number of pending chunks"
+
+        if not self.workers or self.workers < 2:
+            for chunk in self._chunks(values): yield profileChunk(chunk, self.examples, self.masker)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+
+            pending = []
+
+            for chunk in self._chunks(values):
+
+                pending.append(pool.submit(profileChunk, chunk, self.examples, self.masker))
+
+                # Drzim v pamati najviac 2 chunky na proces
+                if len(pending) >= 2 * self.workers: yield pending.pop(0).result()
+
+            for future in pending: yield future.result()
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def profile(self, values):
+        "Returns profile of the column given as iterable of values"
+
+        acc = profileChunk([], self.examples)
+
+        for part in self._parts(values): mergeStats(acc, part, self.examples)
+
+        #----------------------------------------------------------------------
+        # Vysledok s top-K maskami
+        #----------------------------------------------------------------------
+        filled = acc['count'] - acc['nulls']
+        masks  = sorted(acc['masks'].items(), key=lambda item: item[1][0], reverse=True)
+
+        return {'count'  : acc['count'  ],
+                'nulls'  : acc['nulls'  ],
+                'empty'  : acc['empty'  ],
+                'minLen' : acc['minLen' ],
+                'maxLen' : acc['maxLen' ],
+                'avgLen' : acc['sumLen'] / filled if filled else None,
+                'numbers': acc['numbers'],
+                'dates'  : acc['dates'  ],
+                'distinctMasks': len(masks),
+                'masks'  : [(mask, cnt, exs) for mask, (cnt, exs) in masks[:self.topK]]}
+
+    #--------------------------------------------------------------------------
+    def profileRows(self, rows, keys=None):
+        "Returns {key: profile} for iterable of dicts, profiling every column in a separate pass over rows list"
+
+        rows = rows if isinstance(rows, list) else list(rows)
+
+        if keys is None: keys = list(rows[0].keys()) if rows else []
+
+        return {key: self.profile(row.get(key) for row in rows) for key in keys}
+
+#==============================================================================
+# Column profiler
+#------------------------------------------------------------------------------
+print(f'SIQO profiler library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    prof = SiqoProfiler(chunkSize=2)
+
+    print(prof.profile(['8001011234', 'Abc 12', None, '', '2024.03.01', 'Xyz 99', '12.5']))
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
@@ -0,0 +1,263 @@
+#==============================================================================
+# Siqo row diff library
+#------------------------------------------------------------------------------
+import marshal
+from   hashlib            import blake2b
+from   operator           import itemgetter
+
+from   rowindex           import SiqoRowIndex
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_DIGEST     = 16       # Dlzka odtlacku riadku v bajtoch
+_MARSHAL    = 2        # Verzia marshal formatu bez referencii, rovnake hodnoty davaju rovnake bajty
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Fingerprints
+#------------------------------------------------------------------------------
+def hasher(columns):
+    "Returns function returning blake2b digest of row values in columns order, missing column is hashed as None"
+
+    columns = tuple(columns)
+
+    # itemgetter je rychly, ale pre jeden stlpec nevracia tuple a pri chybajucom stlpci zlyha
+    if len(columns) > 1: getter = itemgetter(*columns)
+    else               : getter = lambda row: tuple(map(row.get, columns))
+
+    def toRet(row):
+
+        try   : vals = getter(row)
+        except KeyError: vals = tuple(map(row.get, columns))
+
+        # marshal je rychly pre zakladne typy, ostatne (Decimal, datetime) cez repr s prefixom
+        try   : data = marshal.dumps(vals, _MARSHAL)
+        except ValueError: data = b'\0' + repr(vals).encode('utf-8', 'surrogatepass')
+
+        return blake2b(data, digest_size=_DIGEST).digest()
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def fingerprint(row, columns):
+    "Returns blake2b digest of row values in columns order, missing column is hashed as None"
+
+    return hasher(columns)(row)
+
+#------------------------------------------------------------------------------
+def fingerprints(index, columns):
+    "Returns {key: digest} of unique SiqoRowIndex or {key: [digests]} of multi SiqoRowIndex"
+
+    digest = hasher(columns)
+
+    if index.unique: return {key: digest(row) for key, row in index.index.items()}
+
+    return {key: [digest(row) for row in rows] for key, rows in index.index.items()}
+
+#==============================================================================
+# Field level diff
+#------------------------------------------------------------------------------
+def dicDiffer(ref, tst):
+    "Returns differences between two simple Dictionaries"
+
+    toRet = {}
+
+    #--------------------------------------------------------------------------
+    # Prejdem vsetky polozky v Ref
+    #--------------------------------------------------------------------------
+    for refKey, refVal in ref.items():
+
+        # Skontrolujem, ci sa nachadza aj v tst
+        if refKey in tst:
+
+            # Skontrolujem, ci su rovnake hodnoty
+            if refVal != tst[refKey]: toRet[refKey] = {'key':refKey, 'ref':refVal, 'tst':tst[refKey]}
+
+        else: toRet[refKey] = {'key':refKey, 'ref':refVal, 'tst':None}
+
+    #--------------------------------------------------------------------------
+    # Prejdem vsetky polozky v Tst
+    #--------------------------------------------------------------------------
+    for tstKey, tstVal in tst.items():
+
+        # Skontrolujem, ci sa nachadza aj v ref
+        if tstKey not in ref: toRet[tstKey] = {'key':tstKey, 'ref':None, 'tst':tstVal}
+
+    #--------------------------------------------------------------------------
+    return toRet
+
+#------------------------------------------------------------------------------
+def _differ(ref, tst, colSet):
+    "Returns dicDiffer of the rows limited to compared columns, missing column equals None"
+
+    return {col: item for col, item in dicDiffer(ref, tst).items() if col in colSet and item['ref'] != item['tst']}
+
+#==============================================================================
+# Row diff engine
+#------------------------------------------------------------------------------
+def _groups(index):
+    "Returns {key: [rows]} of SiqoRowIndex"
+
+    if index.unique: return {key: [row] for key, row in index.index.items()}
+
+    return index.index
+
+#------------------------------------------------------------------------------
+def _match(refRows, tstRows, digest):
+    "Returns (refRest, tstRest) of rows in the group without a tst/ref row with the same fingerprint"
+
+    pool = {}
+    for row in tstRows: pool.setdefault(digest(row), []).append(row)
+
+    refRest = []
+
+    for row in refRows:
+
+        same = pool.get(digest(row))
+
+        if same: same.pop()
+        else   : refRest.append(row)
+
+    tstRest = [row for rows in pool.values() for row in rows]
+
+    return (refRest, tstRest)
+
+#------------------------------------------------------------------------------
+def rowDiff(ref, tst, keys=(), columns=None, ignore=()):
+    """
+    Returns differences between two lists of dicts (or SiqoRowIndex) matched
+    by key columns. Rows with the same key are compared by blake2b fingerprint
+    of values in compared columns and only mismatches go to dicDiffer.
+    Columns default to all columns of both sides without ignore.
+    Returns {'missingInTst':{key:[rows]}, 'extraInTst':{key:[rows]},
+             'differ':{key:[diffs]}, 'columns':{column: changes}, 'stats':{}}
+    """
+
+    refIdx = ref if isinstance(ref, SiqoRowIndex) else SiqoRowIndex(ref, keys)
+    tstIdx = tst if isinstance(tst, SiqoRowIndex) else SiqoRowIndex(tst, keys)
+
+    refDic = _groups(refIdx)
+    tstDic = _groups(tstIdx)
+
+    #--------------------------------------------------------------------------
+    # Porovnavane stlpce v pevnom poradi, aby odtlacok nezavisel od poradia klucov v riadku
+    #--------------------------------------------------------------------------
+    if columns is None:
+
+        columns = set()
+
+        for dic in (refDic, tstDic):
+            for rows in dic.values():
+                for row in rows: columns.update(row)
+
+    columns = sorted(set(columns) - set(ignore), key=str)
+    colSet  = set(columns)
+    digest  = hasher(columns)
+
+    toRet  = {'missingInTst':{}, 'extraInTst':{}, 'differ':{}, 'columns':{col:0 for col in columns}}
+    counts = toRet['columns']
+    same   = 0
+    change = 0
+
+    #--------------------------------------------------------------------------
+    # Prejdem vsetky kluce v Ref
+    #--------------------------------------------------------------------------
+    for key, refRows in refDic.items():
+
+        tstRows = tstDic.get(key)
+
+        if tstRows is None:
+            toRet['missingInTst'][key] = refRows
+            continue
+
+        #----------------------------------------------------------------------
+        # Najcastejsi pripad jeden riadok na kluc
+        #----------------------------------------------------------------------
+        if len(refRows) == 1 and len(tstRows) == 1:
+
+            if digest(refRows[0]) == digest(tstRows[0]):
+                same += 1
+                continue
+
+            pairs = [(refRows[0], tstRows[0])]
+
+        #----------------------------------------------------------------------
+        # Viac riadkov na kluc, zhodne odtlacky sparujem, zvysok porovnam v poradi.
+        # Riadky navyse na jednej strane su chybajuce alebo extra, nie zmenene
+        #----------------------------------------------------------------------
+        else:
+            (refRest, tstRest) = _match(refRows, tstRows, digest)
+
+            same += len(refRows) - len(refRest)
+            pairs = list(zip(refRest, tstRest))
+
+            if len(refRest) > len(pairs): toRet['missingInTst'][key] = refRest[len(pairs):]
+            if len(tstRest) > len(pairs): toRet['extraInTst'  ][key] = tstRest[len(pairs):]
+
+        #----------------------------------------------------------------------
+        # Field level diff len pre nezhodne odtlacky
+        #----------------------------------------------------------------------
+        diffs = []
+
+        for refRow, tstRow in pairs:
+
+            diff = _differ(refRow, tstRow, colSet)
+
+            # Odtlacky sa lisia, ale hodnoty su rovnake (napr. 1 a 1.0)
+            if not diff:
+                same += 1
+                continue
+
+            for col in diff: counts[col] += 1
+            diffs.append(diff)
+
+        if diffs:
+            toRet['differ'][key] = diffs
+            change += len(diffs)
+
+    #--------------------------------------------------------------------------
+    # Prejdem vsetky kluce v Tst, ktore nie su v Ref
+    #--------------------------------------------------------------------------
+    for key, tstRows in tstDic.items():
+
+        if key not in refDic: toRet['extraInTst'][key] = tstRows
+
+    #--------------------------------------------------------------------------
+    # Statistika
+    #--------------------------------------------------------------------------
+    toRet['stats'] = {'ref'    : refIdx.rows
+                     ,'tst'    : tstIdx.rows
+                     ,'same'   : same
+                     ,'missing': sum(len(rows) for rows in toRet['missingInTst'].values())
+                     ,'extra'  : sum(len(rows) for rows in toRet['extraInTst'  ].values())
+                     ,'changed': change
+                     }
+
+    return toRet
+
+#==============================================================================
+# Row diff
+#------------------------------------------------------------------------------
+print(f'SIQO rowdiff library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    ref = [{'id':1, 'a':'x', 'b':1  }, {'id':2, 'a':'y', 'b':2}, {'id':3, 'a':'z', 'b':3}]
+    tst = [{'id':1, 'a':'x', 'b':1.0}, {'id':2, 'a':'Y', 'b':2}, {'id':4, 'a':'w', 'b':4}]
+
+    res = rowDiff(ref, tst, ['id'])
+
+    print(res['differ'], res['columns'], res['stats'])
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
@@ -0,0 +1,196 @@
+#==============================================================================
+# Siqo row index library
+#------------------------------------------------------------------------------
+import sys
+from   operator           import itemgetter
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# SiqoRowIndex
+#------------------------------------------------------------------------------
+class SiqoRowIndex:
+    """
+    Index of list of dicts by key columns. Keys are tuples of the key values,
+    so ('1', '23') and ('12', '3') never collide and no strings are built.
+    In unique mode a key maps to one row and a duplicate raises KeyError,
+    in multi mode a key maps to the list of rows. Lookup, insert and delete
+    are O(1) (delete in multi mode is O(rows with the same key)).
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, rows=(), keys=(), unique=False):
+        "Call constructor of SiqoRowIndex and index the rows by keys"
+
+        self.keys   = tuple(keys)                         # Klucove stlpce
+        self.unique = unique                              # Jeden riadok na kluc
+        self.index  = {}                                  # {tuple kluca: row alebo [rows]}
+        self.rows   = 0                                   # Pocet riadkov v indexe
+
+        # itemgetter vracia pre jeden kluc hodnotu, preto ho obalim do tuple
+        if   len(self.keys) == 0: self.keyOf = lambda row: ()
+        elif len(self.keys) == 1:
+            get = itemgetter(self.keys[0])
+            self.keyOf = lambda row: (get(row),)
+
+        else: self.keyOf = itemgetter(*self.keys)
+
+        self.extend(rows)
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+
+        return len(self.index)
+
+    #--------------------------------------------------------------------------
+    def __contains__(self, key):
+
+        return key in self.index
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+
+        return iter(self.index)
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, key):
+
+        return self.index[key]
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def insert(self, row):
+        "Inserts row into the index"
+
+        key = self.keyOf(row)
+
+        if self.unique:
+            if key in self.index: raise KeyError(f'SIQO.SiqoRowIndex: Duplicate key {key}')
+            self.index[key] = row
+
+        else:
+            rows = self.index.get(key)
+
+            if rows is None: self.index[key] = [row]
+            else           : rows.append(row)
+
+        self.rows += 1
+
+    #--------------------------------------------------------------------------
+    def extend(self, rows):
+        "Inserts iterable of rows into the index, returns number of new keys"
+
+        index  = self.index
+        keyOf  = self.keyOf
+        before = len(index)
+        count  = 0
+
+        # Pri duplicitnom kluci zostanu vlozene riadky pred nim, pocet riadkov musi sediet
+        try:
+            #------------------------------------------------------------------
+            # Unique mod, duplicitny kluc je chyba
+            #------------------------------------------------------------------
+            if self.unique:
+
+                for row in rows:
+
+                    key = keyOf(row)
+                    if key in index: raise KeyError(f'SIQO.SiqoRowIndex: Duplicate key {key}')
+
+                    index[key] = row
+                    count += 1
+
+            #------------------------------------------------------------------
+            # Multi mod
+            #------------------------------------------------------------------
+            else:
+                for row in rows:
+
+                    key = keyOf(row)
+                    lst = index.get(key)
+
+                    if lst is None: index[key] = [row]
+                    else          : lst.append(row)
+
+                    count += 1
+
+        finally: self.rows += count
+
+        return len(index) - before
+
+    #--------------------------------------------------------------------------
+    def delete(self, row):
+        "Deletes row (the same object) from the index, raises KeyError if it is not indexed"
+
+        key = self.keyOf(row)
+
+        if self.unique:
+            if self.index.get(key) is not row: raise KeyError(f'SIQO.SiqoRowIndex: Row with key {key} is not indexed')
+            del self.index[key]
+
+        else:
+            rows = self.index.get(key, [])
+
+            for i, item in enumerate(rows):
+                if item is row: break
+            else: raise KeyError(f'SIQO.SiqoRowIndex: Row with key {key} is not indexed')
+
+            del rows[i]
+            if not rows: del self.index[key]
+
+        self.rows -= 1
+
+    #--------------------------------------------------------------------------
+    def remove(self, key):
+        "Removes key with all its rows and returns them"
+
+        toRet = self.index.pop(key)
+
+        if self.unique: self.rows -= 1
+        else          : self.rows -= len(toRet)
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def get(self, *values, default=None):
+        "Returns row (unique) or list of rows (multi) for key values"
+
+        return self.index.get(values, default)
+
+    #--------------------------------------------------------------------------
+    def stats(self):
+        "Returns statistics of the index, bytes are size of the index structures without rows"
+
+        size = sys.getsizeof(self.index) + sum(sys.getsizeof(key) for key in self.index)
+
+        if not self.unique: size += sum(sys.getsizeof(rows) for rows in self.index.values())
+
+        return {'keys':len(self.index), 'rows':self.rows, 'unique':self.unique, 'bytes':size}
+
+#==============================================================================
+# Row index
+#------------------------------------------------------------------------------
+print(f'SIQO rowindex library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    idx = SiqoRowIndex([{'a':'1', 'b':'23'}, {'a':'12', 'b':'3'}, {'a':'1', 'b':'23'}], ['a', 'b'])
+
+    print(len(idx), idx.get('1', '23'), idx.stats())
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
@@ -0,0 +1,218 @@
+#==============================================================================
+# Siqo object snapshot library
+#------------------------------------------------------------------------------
+import os
+import lzma
+import mmap
+import zlib
+import struct
+import pickle
+
+from   fileio             import SiqoAtomicWriter
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_MAGIC      = b'SIQOSNAP'          # Zaciatok suboru
+_END        = b'SIQOEND\0'         # Koniec suboru
+_SNAP_VER   = 2                    # Verzia formatu snapshotu, od 2 su komprimovane aj buffery
+
+_HEAD       = struct.Struct('<8sHB5x')      # magic, verzia, kompresia, rezerva
+_TAIL       = struct.Struct('<QQI4x8s')     # dlzka pickle sekcie, pocet bufferov, crc32, koniec
+_SIZES      = struct.Struct('<QQ')          # zaciatok paticky pokryty crc32 (dlzka pickle sekcie, pocet bufferov)
+_SLOT       = struct.Struct('<QQ')          # offset a dlzka buffera
+
+_ALIGN      = 64                   # Zarovnanie bufferov pre zero-copy numpy
+_CHUNK      = 1 << 20              # Velkost bloku pri kontrole crc32
+
+_COMPRESS   = {None:0, 'zlib':1, 'lzma':2}
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Writing
+#------------------------------------------------------------------------------
+def _compressor(compress, level):
+    "Returns new compressor object for compress or None"
+
+    if compress == 'zlib': return zlib.compressobj(level if level is not None else 6)
+    if compress == 'lzma': return lzma.LZMACompressor(preset=level if level is not None else 6)
+
+    return None
+
+#------------------------------------------------------------------------------
+class _Sink:
+    "Write target for pickler, compresses the stream and keeps crc32 and length"
+
+    #--------------------------------------------------------------------------
+    def __init__(self, file, compress, level):
+
+        self.file = file
+        self.crc  = 0
+        self.size = 0
+
+        self.comp = _compressor(compress, level)
+
+    #--------------------------------------------------------------------------
+    def raw(self, data):
+        "Writes data without compression"
+
+        self.file.write(data)
+        self.crc   = zlib.crc32(data, self.crc)
+        self.size += len(data)
+
+    #--------------------------------------------------------------------------
+    def write(self, data):
+
+        if self.comp is not None: data = self.comp.compress(data)
+        if data                 : self.raw(data)
+
+    #--------------------------------------------------------------------------
+    def flush(self):
+        "Writes the rest of the compressed stream"
+
+        if self.comp is not None: self.raw(self.comp.flush())
+
+#------------------------------------------------------------------------------
+def saveSnapshot(fileName, obj, compress=None, level=None):
+    "Atomically saves obj as snapshot: pickle protocol 5 with out-of-band buffers, compress is None, 'zlib' or 'lzma'"
+
+    if compress not in _COMPRESS: raise ValueError(f'SIQO.saveSnapshot: Unknown compression {compress}')
+
+    buffers = []
+
+    with SiqoAtomicWriter(fileName, 'wb') as file:
+
+        sink = _Sink(file, compress, level)
+        sink.raw(_HEAD.pack(_MAGIC, _SNAP_VER, _COMPRESS[compress]))
+
+        #----------------------------------------------------------------------
+        # Pickle sekcia, velke buffery (napr. numpy polia) idu mimo nej
+        #----------------------------------------------------------------------
+        pickle.Pickler(sink, protocol=5, buffer_callback=buffers.append).dump(obj)
+        sink.flush()
+
+        pickleLen = sink.size - _HEAD.size
+
+        #----------------------------------------------------------------------
+        # Buffery zarovnane, aby sa dali namapovat. Pri kompresii kazdy buffer
+        # zvlast po blokoch, namapovat sa potom nedaju
+        #----------------------------------------------------------------------
+        slots = []
+
+        for buf in buffers:
+
+            data  = buf.raw()
+            comp  = _compressor(compress, level)
+
+            sink.raw(b'\0' * (-sink.size % _ALIGN))
+            start = sink.size
+
+            if comp is None: sink.raw(data)
+            else:
+                for pos in range(0, data.nbytes, _CHUNK):
+
+                    part = comp.compress(data[pos:pos + _CHUNK])
+                    if part: sink.raw(part)
+
+                sink.raw(comp.flush())
+
+            slots.append(_SLOT.pack(start, sink.size - start))
+
+        #----------------------------------------------------------------------
+        # Paticka so zoznamom bufferov a kontrolnym suctom, crc32 pokryva aj paticku
+        #----------------------------------------------------------------------
+        sink.raw(b''.join(slots))
+
+        sizes = _SIZES.pack(pickleLen, len(buffers))
+        file.write(_TAIL.pack(pickleLen, len(buffers), zlib.crc32(sizes, sink.crc), _END))
+
+    return sink.size
+
+#==============================================================================
+# Reading
+#------------------------------------------------------------------------------
+def _crc(view):
+    "Returns crc32 of the memoryview computed in blocks"
+
+    toRet = 0
+    for pos in range(0, len(view), _CHUNK): toRet = zlib.crc32(view[pos:pos + _CHUNK], toRet)
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def loadSnapshot(fileName, useMmap=True, verify=True):
+    "Returns object loaded from snapshot. With useMmap the uncompressed buffers are read-only views of the mapped file"
+
+    with open(fileName, 'rb') as file:
+
+        if useMmap: view = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            # Zapisovatelna kopia, buffery budu zapisovatelne
+            view = memoryview(bytearray(os.fstat(file.fileno()).st_size))
+            file.readinto(view)
+
+    #--------------------------------------------------------------------------
+    # Hlavicka a paticka
+    #--------------------------------------------------------------------------
+    if len(view) < _HEAD.size + _TAIL.size: raise ValueError(f'SIQO.loadSnapshot: {fileName} is not a snapshot')
+
+    (magic, version, compress) = _HEAD.unpack(view[:_HEAD.size])
+    (pickleLen, count, crc, end) = _TAIL.unpack(view[-_TAIL.size:])
+
+    if magic != _MAGIC or end != _END: raise ValueError(f'SIQO.loadSnapshot: {fileName} is not a snapshot')
+    if version > _SNAP_VER           : raise ValueError(f'SIQO.loadSnapshot: {fileName} has unsupported version {version}')
+
+    tail   = len(view) - _TAIL.size
+    footer = tail - count * _SLOT.size
+
+    if footer < _HEAD.size + pickleLen: raise ValueError(f'SIQO.loadSnapshot: {fileName} is damaged')
+
+    # Kontrolny sucet celeho suboru vratane zoznamu bufferov a velkosti v paticke
+    if verify and zlib.crc32(view[tail:tail + _SIZES.size], _crc(view[:tail])) != crc:
+        raise ValueError(f'SIQO.loadSnapshot: {fileName} checksum does not match')
+
+    #--------------------------------------------------------------------------
+    # Buffery ako pohlady do suboru bez kopirovania, komprimovane rozbalim
+    #--------------------------------------------------------------------------
+    buffers = []
+
+    for i in range(count):
+
+        (offset, length) = _SLOT.unpack(view[footer + i * _SLOT.size:footer + (i + 1) * _SLOT.size])
+
+        if offset < _HEAD.size + pickleLen or offset + length > footer: raise ValueError(f'SIQO.loadSnapshot: {fileName} is damaged')
+
+        # Verzia 1 komprimovala iba pickle sekciu
+        if   compress == 0 or version < 2: buffers.append(view[offset:offset + length])
+        elif compress == 1               : buffers.append(bytearray(zlib.decompress(view[offset:offset + length])))
+        else                             : buffers.append(bytearray(lzma.decompress(view[offset:offset + length])))
+
+    #--------------------------------------------------------------------------
+    # Pickle sekcia
+    #--------------------------------------------------------------------------
+    data = view[_HEAD.size:_HEAD.size + pickleLen]
+
+    if   compress == 1: data = zlib.decompress(data)
+    elif compress == 2: data = lzma.decompress(data)
+
+    return pickle.loads(data, buffers=buffers)
+
+#------------------------------------------------------------------------------
+def isSnapshot(fileName):
+    "Returns True if the file starts with the snapshot header"
+
+    with open(fileName, 'rb') as file: return file.read(len(_MAGIC)) == _MAGIC
+
+#==============================================================================
+# Object snapshot
+#------------------------------------------------------------------------------
+print(f'SIQO snapshot library ver {_VER}')
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
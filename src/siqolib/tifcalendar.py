@@ -0,0 +1,217 @@
+#==============================================================================
+# Siqo ADAT calendar library
+#------------------------------------------------------------------------------
+from   array           import array
+from   datetime        import date, timedelta
+
+try   : import numpy as np
+except ImportError: np = None
+
+from   singleton       import SingletonMeta
+from   general         import _TIF_BASE
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER      = '1.00'
+
+_CAL_END  = date(2100, 12, 31)    # Posledny den v kalendari
+_PERIODS  = ('D', 'W', 'M', 'Q', 'Y')
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# SiqoCalendar
+#------------------------------------------------------------------------------
+class SiqoCalendar(metaclass=SingletonMeta):
+    """
+    Precomputed ADAT calendar from _TIF_BASE up to _CAL_END. Every attribute of
+    a day is stored in a compact array indexed by ADAT, so lookups are O(1)
+    and columns of ADATs can be bucketed into periods by array indexing.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, end=_CAL_END):
+        "Builds calendar table for ADATs from 0 up to the date end"
+
+        self.size    = (end - _TIF_BASE).days + 1   # Pocet dni v kalendari
+        self.year    = array('H')                   # Rok
+        self.month   = array('B')                   # Mesiac 1..12
+        self.day     = array('B')                   # Den v mesiaci 1..31
+        self.weekday = array('B')                   # Den v tyzdni, 0=pondelok
+        self.mStart  = array('i')                   # ADAT zaciatku mesiaca
+        self.qStart  = array('i')                   # ADAT zaciatku kvartalu
+        self.yStart  = array('i')                   # ADAT zaciatku roka
+        self.mEnd    = array('i', [0]) * self.size  # ADAT konca mesiaca
+        self.qEnd    = array('i', [0]) * self.size  # ADAT konca kvartalu
+        self.yEnd    = array('i', [0]) * self.size  # ADAT konca roka
+
+        #----------------------------------------------------------------------
+        # Periody prveho dna mozu zacinat pred kalendarom
+        #----------------------------------------------------------------------
+        dat    = _TIF_BASE
+        oneDay = timedelta(days=1)
+
+        mStart = (date(dat.year, dat.month,                  1) - _TIF_BASE).days
+        qStart = (date(dat.year, 3*((dat.month-1)//3) + 1,   1) - _TIF_BASE).days
+        yStart = (date(dat.year, 1,                          1) - _TIF_BASE).days
+
+        #----------------------------------------------------------------------
+        # Prejdem vsetky dni kalendara
+        #----------------------------------------------------------------------
+        for adat in range(self.size):
+
+            if dat.day == 1:
+                mStart = adat
+                if dat.month in (1, 4, 7, 10): qStart = adat
+                if dat.month == 1            : yStart = adat
+
+            self.year   .append(dat.year     )
+            self.month  .append(dat.month    )
+            self.day    .append(dat.day      )
+            self.weekday.append(dat.weekday())
+            self.mStart .append(mStart       )
+            self.qStart .append(qStart       )
+            self.yStart .append(yStart       )
+
+            dat += oneDay
+
+        #----------------------------------------------------------------------
+        # Konce period doplnim spatne, posledny den kalendara je koniec roka
+        #----------------------------------------------------------------------
+        mEnd = qEnd = yEnd = self.size - 1
+
+        for adat in range(self.size - 2, -1, -1):
+
+            if self.day[adat + 1] == 1:
+                mEnd = adat
+                if self.month[adat + 1] in (1, 4, 7, 10): qEnd = adat
+                if self.month[adat + 1] == 1            : yEnd = adat
+
+            self.mEnd[adat] = mEnd
+            self.qEnd[adat] = qEnd
+            self.yEnd[adat] = yEnd
+
+        self.mEnd[-1] = self.qEnd[-1] = self.yEnd[-1] = self.size - 1
+
+    #--------------------------------------------------------------------------
+    def _check(self, adat):
+        "Raises ValueError if adat is out of calendar range"
+
+        if not 0 <= adat < self.size:
+            raise ValueError(f"SiqoCalendar: ADAT {adat} is out of calendar range 0..{self.size-1}")
+
+    #==========================================================================
+    # O(1) lookups
+    #--------------------------------------------------------------------------
+    def info(self, adat):
+        "Returns (year, month, day, weekday, month-start ADAT, month-end ADAT) for adat"
+
+        self._check(adat)
+
+        return (self.year[adat], self.month[adat], self.day[adat], self.weekday[adat], self.mStart[adat], self.mEnd[adat])
+
+    #--------------------------------------------------------------------------
+    def isWeekend(self, adat):
+        "Returns True if adat is Saturday or Sunday"
+
+        self._check(adat)
+        return self.weekday[adat] >= 5
+
+    #--------------------------------------------------------------------------
+    def periodStart(self, adat, period='M'):
+        "Returns ADAT of the first day of the period ('D', 'W', 'M', 'Q', 'Y') containing adat"
+
+        self._check(adat)
+
+        if   period == 'D': return adat
+        elif period == 'W': return adat - self.weekday[adat]
+        elif period == 'M': return self.mStart[adat]
+        elif period == 'Q': return self.qStart[adat]
+        elif period == 'Y': return self.yStart[adat]
+
+        raise ValueError(f"SiqoCalendar.periodStart: Unknown period '{period}', expected one of {_PERIODS}")
+
+    #--------------------------------------------------------------------------
+    def periodEnd(self, adat, period='M'):
+        "Returns ADAT of the last day of the period ('D', 'W', 'M', 'Q', 'Y') containing adat"
+
+        self._check(adat)
+
+        if   period == 'D': return adat
+        elif period == 'W': return adat - self.weekday[adat] + 6
+        elif period == 'M': return self.mEnd[adat]
+        elif period == 'Q': return self.qEnd[adat]
+        elif period == 'Y': return self.yEnd[adat]
+
+        raise ValueError(f"SiqoCalendar.periodEnd: Unknown period '{period}', expected one of {_PERIODS}")
+
+    #==========================================================================
+    # Column bucketing
+    #--------------------------------------------------------------------------
+    def bucket(self, adats, period='M'):
+        "Returns period-start ADATs for column of integer ADATs. Numpy int array if numpy is available, list otherwise"
+
+        if period not in _PERIODS:
+            raise ValueError(f"SiqoCalendar.bucket: Unknown period '{period}', expected one of {_PERIODS}")
+
+        #----------------------------------------------------------------------
+        # Vektorovy prevod cez numpy indexovanie
+        #----------------------------------------------------------------------
+        if np is not None:
+
+            idx = np.asarray(adats, dtype=np.int64)
+
+            if idx.size and (idx.min() < 0 or idx.max() >= self.size):
+                raise ValueError(f"SiqoCalendar.bucket: ADAT column is out of calendar range 0..{self.size-1}")
+
+            if   period == 'D': return idx
+            elif period == 'W': return idx - np.frombuffer(self.weekday, dtype=np.uint8)[idx]
+            elif period == 'M': return np.frombuffer(self.mStart, dtype=np.int32)[idx]
+            elif period == 'Q': return np.frombuffer(self.qStart, dtype=np.int32)[idx]
+            else              : return np.frombuffer(self.yStart, dtype=np.int32)[idx]
+
+        #----------------------------------------------------------------------
+        # Pure python prevod
+        #----------------------------------------------------------------------
+        return [self.periodStart(adat, period) for adat in adats]
+
+    #--------------------------------------------------------------------------
+    def bucketCount(self, adats, period='M'):
+        "Returns dict {period-start ADAT: count} for column of integer ADATs"
+
+        buckets = self.bucket(adats, period)
+
+        if np is not None:
+
+            keys, counts = np.unique(buckets, return_counts=True)
+            return dict(zip(keys.tolist(), counts.tolist()))
+
+        toRet = {}
+        for key in buckets: toRet[key] = toRet.get(key, 0) + 1
+
+        return toRet
+
+#==============================================================================
+# ADAT calendar
+#------------------------------------------------------------------------------
+print(f'SIQO tifcalendar library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    cal = SiqoCalendar()
+
+    print(cal.info(19500))
+    print(cal.periodStart(19500, 'Q'), cal.periodEnd(19500, 'Q'))
+    print(cal.bucketCount([19500, 19501, 19540], 'M'))
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
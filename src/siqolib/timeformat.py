@@ -0,0 +1,162 @@
+#==============================================================================
+# Siqo timestamp format library
+#------------------------------------------------------------------------------
+from   datetime        import date, datetime
+
+from   general         import _TIF_ORD, _TIF_DAY
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_CACHE_DAYS = 4096                                  # Max pocet dni v cache prefixov
+_TWO        = [f'{i:02d}' for i in range(100)]      # Dvojciferne stringy 00..99
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# SiqoTimeFormat
+#------------------------------------------------------------------------------
+class SiqoTimeFormat:
+    """
+    Fixed-format parser/formatter for TIME_FORMAT ('%Y.%m.%d %H:%M:%S') and ADAT
+    strings ('%Y.%m.%d.'). Values are built from integers and sliced back, date
+    prefixes are cached per ADAT day so strftime/strptime are never called.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, cacheDays=_CACHE_DAYS):
+        "Call constructor of SiqoTimeFormat and initialise it with empty caches"
+
+        self.cacheDays = cacheDays     # Max pocet dni v kazdej cache
+        self.prefixes  = {}            # Cache {adat: 'YYYY.MM.DD'}
+        self.adats     = {}            # Cache {'YYYY.MM.DD': adat}
+
+    #--------------------------------------------------------------------------
+    def prefix(self, adat):
+        "Returns cached 'YYYY.MM.DD' prefix for integer adat"
+
+        toRet = self.prefixes.get(adat)
+
+        if toRet is None:
+
+            if len(self.prefixes) >= self.cacheDays: self.prefixes.clear()
+
+            dat   = date.fromordinal(_TIF_ORD + adat)
+            toRet = f'{dat.year:04d}.{_TWO[dat.month]}.{_TWO[dat.day]}'
+            self.prefixes[adat] = toRet
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def prefixToTif(self, s):
+        "Returns adat for 'YYYY.MM.DD' prefix of the string s"
+
+        key   = s[:10]
+        toRet = self.adats.get(key)
+
+        if toRet is None:
+
+            if len(self.adats) >= self.cacheDays: self.adats.clear()
+
+            toRet = date(int(key[0:4]), int(key[5:7]), int(key[8:10])).toordinal() - _TIF_ORD
+            self.adats[key] = toRet
+
+        return toRet
+
+    #==========================================================================
+    # Formatting
+    #--------------------------------------------------------------------------
+    def format(self, dt):
+        "Returns datetime dt formatted as TIME_FORMAT"
+
+        return f'{self.prefix(dt.toordinal() - _TIF_ORD)} {_TWO[dt.hour]}:{_TWO[dt.minute]}:{_TWO[dt.second]}'
+
+    #--------------------------------------------------------------------------
+    def formatTif(self, adat):
+        "Returns tif.part_of_day value formatted as TIME_FORMAT"
+
+        day  = int(adat // 1)
+        secs = int(round((adat - day) * _TIF_DAY * 1e6) // 1000000)
+
+        # Zaokruhlenie moze pretiect do dalsieho dna
+        if secs >= _TIF_DAY: day, secs = day + 1, secs - _TIF_DAY
+
+        return f'{self.prefix(day)} {_TWO[secs // 3600]}:{_TWO[secs // 60 % 60]}:{_TWO[secs % 60]}'
+
+    #--------------------------------------------------------------------------
+    def tifToChar(self, adat, dec=True):
+        "Same as general.tifToChar: 'HH:MI:SS' for dec, 'YYYY.MM.DD.' otherwise"
+
+        s = self.formatTif(adat)
+
+        if dec: return s[11:]
+        else  : return s[:10] + '.'
+
+    #==========================================================================
+    # Parsing
+    #--------------------------------------------------------------------------
+    def parse(self, s):
+        "Returns naive datetime for TIME_FORMAT string s"
+
+        return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]), int(s[17:19]))
+
+    #--------------------------------------------------------------------------
+    def parseTif(self, s):
+        "Returns tif.part_of_day for TIME_FORMAT string s, or integer adat for 'YYYY.MM.DD.' string"
+
+        adat = self.prefixToTif(s)
+
+        if len(s) < 19: return adat
+
+        return adat + (int(s[11:13])*3600 + int(s[14:16])*60 + int(s[17:19])) / _TIF_DAY
+
+    #==========================================================================
+    # Streaming
+    #--------------------------------------------------------------------------
+    def formatIter(self, values):
+        "Yields TIME_FORMAT strings for iterable of datetimes or tif.part_of_day numbers"
+
+        fmtDt  = self.format
+        fmtTif = self.formatTif
+
+        for val in values:
+
+            if isinstance(val, datetime): yield fmtDt(val)
+            else                        : yield fmtTif(val)
+
+    #--------------------------------------------------------------------------
+    def parseIter(self, strings, tif=False):
+        "Yields datetimes (or tif.part_of_day if tif=True) for iterable of TIME_FORMAT strings"
+
+        parse = self.parseTif if tif else self.parse
+
+        for s in strings: yield parse(s)
+
+#==============================================================================
+# Timestamp format
+#------------------------------------------------------------------------------
+print(f'SIQO timeformat library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    fmt = SiqoTimeFormat()
+
+    print(fmt.format(datetime.now()))
+    print(fmt.formatTif(19500.55))
+    print(fmt.tifToChar(19500.55), fmt.tifToChar(19500.55, dec=False))
+    print(fmt.parse('2024.03.01 13:05:07'))
+    print(fmt.parseTif('2024.03.01 13:05:07'), fmt.parseTif('2024.03.01.'))
+    print(list(fmt.formatIter([19500, 19500.5])))
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
@@ -0,0 +1,135 @@
+#==============================================================================
+# Siqo timestamp service
+#------------------------------------------------------------------------------
+import time
+import pytz
+from   datetime        import datetime, timedelta, timezone
+
+from   general         import TIME_FORMAT
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER          = '1.00'
+
+_TIME_ZONE    = pytz.timezone('CET')   # Timezone in which SIQO services run
+_OFFSET_SLOT  = 900                    # DST prechody su vzdy na hranici 15 minut
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+_stamps       = {}                     # Zdielane instancie {tz: SiqoTimestamp}
+
+#==============================================================================
+# SiqoTimestamp
+#------------------------------------------------------------------------------
+class SiqoTimestamp:
+    """
+    Clock for journal and logger lines. Keeps the UTC offset of the timezone
+    (local time of the process if tz is None) for the current 15-minute slot
+    (DST transitions always fall on a slot boundary) and the formatted strings
+    for the current second, so the timezone conversion and strftime run at
+    most once per second. Use getTimestamp(tz) for the instance shared per tz.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, tz=_TIME_ZONE):
+        "Call constructor of SiqoTimestamp and initialise it for timezone tz, None is local time"
+
+        self.tz     = tz
+        # Stav sa meni naraz cely, aby bol bezpecny pre vlakna
+        # (sekunda, offset v sekundach, tzinfo s offsetom, zaciatok slotu, {format: string})
+        self._state = (None, 0, timezone.utc, None, {})
+
+    #--------------------------------------------------------------------------
+    def _refresh(self, sec):
+        "Refreshes cached state for epoch second sec, the UTC offset only when slot changes"
+
+        (_, offset, tzinfo, slot, _) = self._state
+        newSlot = sec - sec % _OFFSET_SLOT
+
+        if newSlot != slot:
+
+            if self.tz is None: moment = datetime.fromtimestamp(newSlot).astimezone()
+            else              : moment = datetime.fromtimestamp(newSlot, self.tz)
+
+            offset = int(moment.utcoffset().total_seconds())
+            tzinfo = timezone(timedelta(seconds=offset))
+
+        state       = (sec, offset, tzinfo, newSlot, {})
+        self._state = state
+
+        return state
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def stamp(self, fmt=TIME_FORMAT, t=None):
+        "Returns current (or epoch t) time formatted by fmt with second resolution. fmt must not contain %z/%Z"
+
+        if t is None: t = time.time()
+
+        sec   = int(t // 1)
+        state = self._state
+
+        if state[0] != sec: state = self._refresh(sec)
+
+        toRet = state[4].get(fmt)
+
+        if toRet is None:
+            toRet = time.strftime(fmt, time.gmtime(sec + state[1]))
+            state[4][fmt] = toRet
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def now(self):
+        "Returns current aware datetime with the cached UTC offset"
+
+        t     = time.time()
+        state = self._state
+
+        if state[0] != int(t // 1): state = self._refresh(int(t // 1))
+
+        return datetime.fromtimestamp(t, state[2])
+
+    #--------------------------------------------------------------------------
+    def offset(self):
+        "Returns current UTC offset of the timezone in seconds"
+
+        t     = time.time()
+        state = self._state
+
+        if state[0] != int(t // 1): state = self._refresh(int(t // 1))
+
+        return state[1]
+
+#------------------------------------------------------------------------------
+def getTimestamp(tz=_TIME_ZONE):
+    "Returns SiqoTimestamp shared by all callers with the same timezone tz, None is local time"
+
+    toRet = _stamps.get(tz)
+
+    if toRet is None: toRet = _stamps.setdefault(tz, SiqoTimestamp(tz))
+
+    return toRet
+
+#==============================================================================
+# Timestamp service
+#------------------------------------------------------------------------------
+print(f'SIQO timestamp library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    ts = getTimestamp()
+
+    print(ts.stamp(), ts.stamp('%Y-%m-%d %H:%M:%S'), ts.now(), ts.offset(), getTimestamp(None).now())
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
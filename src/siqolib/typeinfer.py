@@ -0,0 +1,304 @@
+#==============================================================================
+# Siqo column type inference library
+#------------------------------------------------------------------------------
+import os
+import re
+import csv
+import json
+from   itertools          import islice
+from   contextlib         import closing
+from   concurrent.futures import ProcessPoolExecutor
+
+from   column             import isNumberCol, isRcCol, isTimeCol, ddmmyyyyCol, yyyymmddCol
+from   jsonstream         import iterArray
+
+#==============================================================================
+# package's constants
+#------------------------------------------------------------------------------
+_VER        = '1.00'
+
+_TYPES      = ('rc', 'timestamp', 'date', 'int', 'float')   # Od najspecifickejsieho typu
+_INT        = re.compile(r'-?\d+')
+
+_THRESHOLD  = 0.99     # Minimalny podiel hodnot daneho typu
+_SETTLE     = 1000     # Po tomto pocte vyplnenych hodnot je typ stlpca rozhodnuty
+_CHUNK_SIZE = 5000     # Pocet riadkov v jednom chunku
+
+#==============================================================================
+# package's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Counting
+#------------------------------------------------------------------------------
+def countValues(vals):
+    "Returns counts {rows, nulls, rc, timestamp, date, int, float} of values matching each type"
+
+    strs  = [val if isinstance(val, str) else str(val) for val in vals if val is not None and val != '']
+    toRet = {'rows':len(vals), 'nulls':len(vals) - len(strs)}
+
+    for typ in _TYPES: toRet[typ] = 0
+    if not strs: return toRet
+
+    num  = isNumberCol(strs)
+    dmy  = ddmmyyyyCol(strs)
+    ymd  = yyyymmddCol(strs)
+
+    toRet['rc'       ] = int(sum(isRcCol  (strs)))
+    toRet['timestamp'] = int(sum(isTimeCol(strs)))
+    toRet['date'     ] = sum(1 for d, y in zip(dmy, ymd) if d or y)
+    toRet['int'      ] = sum(1 for s, n in zip(strs, num) if n and _INT.fullmatch(s))
+    toRet['float'    ] = int(sum(num))
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def mergeCounts(acc, part):
+    "Merges counts {column: counts} part into acc and returns acc"
+
+    for col, cnt in part.items():
+
+        if col not in acc: acc[col] = dict(cnt)
+        else:
+            for key, val in cnt.items(): acc[col][key] += val
+
+    return acc
+
+#------------------------------------------------------------------------------
+def _settled(cnt, threshold, settle):
+    "Returns True if type of the column can not change any more"
+
+    filled = cnt['rows'] - cnt['nulls']
+
+    if filled >= settle: return True
+
+    # Ziadny specificky typ uz nemoze dosiahnut threshold, je to string
+    return filled > 0 and all(filled - cnt[typ] > (1 - threshold) * settle for typ in _TYPES)
+
+#------------------------------------------------------------------------------
+def decide(cnt, threshold=_THRESHOLD):
+    "Returns {type, confidence, rows, nulls, counts} for counts of one column"
+
+    filled = cnt['rows'] - cnt['nulls']
+    toRet  = {'type':'string', 'confidence':0.0, 'rows':cnt['rows'], 'nulls':cnt['nulls'], 'counts':cnt}
+
+    if filled == 0: return toRet
+
+    ratios = {typ: cnt[typ] / filled for typ in _TYPES}
+
+    for typ in _TYPES:
+        if ratios[typ] >= threshold:
+            toRet['type'      ] = typ
+            toRet['confidence'] = ratios[typ]
+            return toRet
+
+    toRet['confidence'] = 1.0 - max(ratios.values())
+    return toRet
+
+#------------------------------------------------------------------------------
+def countRows(rows, keys, threshold=_THRESHOLD, settle=_SETTLE, chunkSize=_CHUNK_SIZE):
+    "Returns counts {column: counts} for iterable of lists (in keys order) or dicts, stops when all columns are settled"
+
+    acc = {}
+    it  = iter(rows)
+
+    while True:
+
+        chunk = list(islice(it, chunkSize))
+        if not chunk: break
+
+        #----------------------------------------------------------------------
+        # Rozdelim chunk na stlpce, nerozhodnute stlpce spocitam
+        #----------------------------------------------------------------------
+        todo = [(i, key) for i, key in enumerate(keys) if key not in acc or not _settled(acc[key], threshold, settle)]
+        if not todo: break
+
+        if isinstance(chunk[0], dict): part = {key: countValues([row.get(key) for row in chunk]) for _, key in todo}
+        else                         : part = {key: countValues([row[i] if i < len(row) else None for row in chunk]) for i, key in todo}
+
+        mergeCounts(acc, part)
+
+    return acc
+
+#==============================================================================
+# File readers
+#------------------------------------------------------------------------------
+def _chain(first, it):
+    "Yields first and then the rest of the iterator"
+
+    yield first
+    yield from it
+
+#------------------------------------------------------------------------------
+def _lines(fileName, start, end, enc):
+    "Yields decoded lines starting in the byte range (start, end>, the first line of the file for start=0"
+
+    with open(fileName, 'rb') as file:
+
+        file.seek(start)
+
+        # Ciastocny riadok patri predchadzajucemu rozsahu
+        if start > 0: file.readline()
+
+        while file.tell() <= end:
+
+            line = file.readline()
+            if not line: break
+
+            yield line.decode(enc)
+
+#------------------------------------------------------------------------------
+def countCsvRange(fileName, start, end, keys, enc='utf-8', delimiter=',', skip=0,
+                  threshold=_THRESHOLD, settle=_SETTLE, chunkSize=_CHUNK_SIZE):
+    "Returns counts for CSV rows in the byte range of the file, skip header rows apply to range from 0 only. Module level function for a process pool"
+
+    rows = csv.reader(_lines(fileName, start, end, enc), delimiter=delimiter)
+    rows = islice(rows, skip if start == 0 else 0, None)
+
+    return countRows(rows, keys, threshold, settle, chunkSize)
+
+#------------------------------------------------------------------------------
+def countJsonlRange(fileName, start, end, keys, enc='utf-8', threshold=_THRESHOLD, settle=_SETTLE, chunkSize=_CHUNK_SIZE):
+    "Returns counts for JSON lines objects in the byte range of the file. Module level function, so it can run in a process pool"
+
+    rows = (json.loads(line) for line in _lines(fileName, start, end, enc) if line.strip())
+
+    return countRows(rows, keys, threshold, settle, chunkSize)
+
+#==============================================================================
+# SiqoTypeInfer
+#------------------------------------------------------------------------------
+class SiqoTypeInfer:
+    """
+    Column type inference for CSV, JSON and JSON lines extracts. Every column
+    settles on rc/timestamp/date/int/float/string with a confidence score using
+    the column validators. Reading stops as soon as every column is settled.
+    With workers > 1 a CSV/JSON lines file is split into byte ranges counted in
+    a process pool; CSV values with embedded newlines need workers=None.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, threshold=_THRESHOLD, settle=_SETTLE, chunkSize=_CHUNK_SIZE, workers=None):
+        "Call constructor of SiqoTypeInfer"
+
+        self.threshold = threshold     # Minimalny podiel hodnot daneho typu
+        self.settle    = settle        # Po tomto pocte vyplnenych hodnot je typ stlpca rozhodnuty
+        self.chunkSize = chunkSize     # Pocet riadkov v jednom chunku
+        self.workers   = workers       # Pocet procesov, None alebo 1 znamena bez poolu
+
+    #--------------------------------------------------------------------------
+    def _result(self, counts, keys):
+        "Returns {column: decision} in keys order"
+
+        empty = {'rows':0, 'nulls':0, **{typ: 0 for typ in _TYPES}}
+        return {key: decide(counts.get(key, empty), self.threshold) for key in keys}
+
+    #--------------------------------------------------------------------------
+    def _ranges(self, fileName):
+        "Returns list of (start, end) byte ranges, one per worker"
+
+        size = os.path.getsize(fileName)
+        step = max(size // self.workers, 1)
+
+        toRet = [(pos, min(pos + step, size)) for pos in range(0, size, step)]
+        return toRet or [(0, size)]
+
+    #--------------------------------------------------------------------------
+    def _pooled(self, func, fileName, args):
+        "Returns merged counts of func over byte ranges of the file"
+
+        acc = {}
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+
+            futures = [pool.submit(func, fileName, a, b, *args) for a, b in self._ranges(fileName)]
+
+            for future in futures: mergeCounts(acc, future.result())
+
+        return acc
+
+    #==========================================================================
+    # API for users
+    #--------------------------------------------------------------------------
+    def inferRows(self, rows, keys=None):
+        "Returns {column: {type, confidence, rows, nulls, counts}} for iterable of dicts or lists with keys"
+
+        it    = iter(rows)
+        first = next(it, None)
+
+        if first is None: return {}
+        if keys  is None: keys = list(first.keys())
+
+        counts = countRows(_chain(first, it), keys, self.threshold, self.settle, self.chunkSize)
+        return self._result(counts, keys)
+
+    #--------------------------------------------------------------------------
+    def inferCsv(self, fileName, enc='utf-8', delimiter=',', keys=None):
+        "Returns inferred column types of CSV file. If keys is None, the first line is the header"
+
+        #----------------------------------------------------------------------
+        # Hlavicka
+        #----------------------------------------------------------------------
+        skip = 0
+
+        if keys is None:
+            with open(fileName, encoding=enc, newline='') as file: keys = next(csv.reader(file, delimiter=delimiter), [])
+            skip = 1
+
+        #----------------------------------------------------------------------
+        # Jeden proces alebo pool procesov
+        #----------------------------------------------------------------------
+        size = os.path.getsize(fileName)
+        args = (keys, enc, delimiter)
+        opts = (self.threshold, self.settle, self.chunkSize)
+
+        if not self.workers or self.workers < 2: counts = countCsvRange(fileName, 0, size, *args, skip, *opts)
+        else                                   : counts = self._pooled(countCsvRange, fileName, args + (skip,) + opts)
+
+        return self._result(counts, keys)
+
+    #--------------------------------------------------------------------------
+    def inferJson(self, fileName, enc='utf-8', keys=None):
+        "Returns inferred column types of JSON file with array of objects or of JSON lines file (*.jsonl), both are sampled"
+
+        #----------------------------------------------------------------------
+        # JSON lines
+        #----------------------------------------------------------------------
+        if fileName.endswith('.jsonl'):
+
+            if keys is None:
+                first = next((line for line in _lines(fileName, 0, os.path.getsize(fileName), enc) if line.strip()), None)
+                keys  = list(json.loads(first).keys()) if first else []
+
+            opts = (self.threshold, self.settle, self.chunkSize)
+
+            if not self.workers or self.workers < 2: counts = countJsonlRange(fileName, 0, os.path.getsize(fileName), keys, enc, *opts)
+            else                                   : counts = self._pooled(countJsonlRange, fileName, (keys, enc) + opts)
+
+            return self._result(counts, keys)
+
+        #----------------------------------------------------------------------
+        # JSON pole objektov citam po prvkoch, subor sa docita iba kym nie su stlpce rozhodnute
+        #----------------------------------------------------------------------
+        with closing(iterArray(fileName, enc=enc)) as rows: return self.inferRows(rows, keys)
+
+#==============================================================================
+# Type inference
+#------------------------------------------------------------------------------
+print(f'SIQO typeinfer library ver {_VER}')
+
+#==============================================================================
+# Unit test
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    infer = SiqoTypeInfer()
+
+    print(infer.inferRows([{'rc':'7801230008', 'dat':'2024.03.01', 'num':'12', 'amt':'12.5', 'txt':'Abc'},
+                           {'rc':'7801230019', 'dat':'01.03.2024', 'num':'-3', 'amt':'1e3' , 'txt':None }]))
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------